@@ -0,0 +1,69 @@
+class AlgoStats:
+    """This class represents the opt-in counters and timings collected by GraphAlgo."""
+
+    def __init__(self, callback=None):
+        """
+        Constructor
+        @param callback: optional function called as callback(op, elapsed, counters) after every recorded call
+        """
+        self.callback = callback
+        self.ops = {}
+        self.last = {}
+
+    def record(self, op: str, elapsed: float, counters: dict) -> None:
+        """
+        Adds one call of op to the aggregated stats and passes it to the callback.
+        @param op: The name of the operation, e.g. "dijkstra"
+        @param elapsed: The time the call took in seconds
+        @param counters: A dictionary of counter name to value for this call
+        @return: None
+        """
+        agg = self.ops.get(op)
+        # First call of op, create its aggregate entry
+        if agg is None:
+            agg = {"calls": 0, "total_time": 0.0, "max_time": 0.0, "counters": {}}
+            self.ops[op] = agg
+        agg["calls"] += 1
+        agg["total_time"] += elapsed
+        if elapsed > agg["max_time"]:
+            agg["max_time"] = elapsed
+        # Sum every counter of this call into the aggregate counters
+        totals = agg["counters"]
+        for name, value in counters.items():
+            totals[name] = totals.get(name, 0) + value
+        self.last[op] = {"time": elapsed, "counters": counters}
+        if self.callback is not None:
+            self.callback(op, elapsed, counters)
+
+    def get(self, op: str) -> dict:
+        """
+        Returns the aggregated stats of op
+        @param op: The name of the operation
+        @return: dictionary with calls, total_time, max_time and counters, or an empty dictionary if op was not called
+        """
+        agg = self.ops.get(op)
+        if agg is None:
+            return {}
+        return agg
+
+    def summary(self) -> dict:
+        """
+        Returns the aggregated stats of all the operations, the average time of each operation is added
+        @return: dictionary of op to its aggregated stats
+        """
+        summary = {}
+        for op, agg in self.ops.items():
+            summary[op] = dict(agg, avg_time=agg["total_time"] / agg["calls"], counters=dict(agg["counters"]))
+        return summary
+
+    def reset(self) -> None:
+        """
+        Clears all the recorded stats, the callback is kept
+        @return: None
+        """
+        self.ops = {}
+        self.last = {}
+
+    def __repr__(self):
+        calls = ", ".join(f"{op}: {agg['calls']}" for op, agg in self.ops.items())
+        return f"AlgoStats({calls})"
@@ -0,0 +1,223 @@
+from multiprocessing import Pool
+from src.GraphInterface import GraphInterface
+from src.PriorityQueues import BinaryHeap
+import math
+import random as rand
+
+# The adjacency and the queue type of the graph, set once in every worker process by attach
+shared = {}
+
+
+def adjacency_of(graph: GraphInterface) -> dict:
+    """
+    Copies the out edges of every node to plain dictionaries, cheap to send to worker processes.
+    @return: dictionary of node id to dictionary (dest, weight)
+    """
+    return {key: dict(graph.all_out_edges_of_node(key)) for key in graph.get_all_v()}
+
+
+def shortest_paths_dag(adjacency: dict, src: int, queue_type=BinaryHeap) -> (list, dict, dict, dict):
+    """
+    Dijkstra from src that also counts the shortest paths, the single source step of Brandes' algorithm.
+    The queue must pop in exact priority order (every queue of src.PriorityQueues except DialBuckets with weights
+    that are not multiples of its quantum).
+    @return: the nodes in the order they were settled, dictionary of distance, dictionary of number of shortest
+    paths, dictionary of the predecessors on shortest paths
+    """
+    order = []
+    dist = {}
+    seen = {src: 0}
+    sigma = {src: 1}
+    preds = {src: []}
+    queue = queue_type()
+    push = queue.push
+    pop = queue.pop
+    push((0, src))
+    while queue:
+        path, node = pop()
+        if node in dist:
+            continue
+        dist[node] = path
+        order.append(node)
+        count = sigma[node]
+        for dest, weight in adjacency[node].items():
+            if dest in dist:
+                continue
+            new_path = path + weight
+            old = seen.get(dest, math.inf)
+            if new_path < old:
+                seen[dest] = new_path
+                sigma[dest] = count
+                preds[dest] = [node]
+                push((new_path, dest))
+            elif new_path == old:
+                # Another shortest path to dest through node
+                sigma[dest] += count
+                preds[dest].append(node)
+    return order, dist, sigma, preds
+
+
+def betweenness_of_sources(sources: list, adjacency: dict = None, queue_type=None) -> dict:
+    """
+    Sums the dependencies of every node over the shortest paths from the given sources (Brandes' accumulation).
+    Without adjacency it uses the one attached to the worker process.
+    @return: dictionary of node id to its summed dependency
+    """
+    if adjacency is None:
+        adjacency = shared["adjacency"]
+        queue_type = shared["queue_type"]
+    betweenness = {}
+    for src in sources:
+        order, dist, sigma, preds = shortest_paths_dag(adjacency, src, queue_type)
+        delta = dict.fromkeys(order, 0)
+        for node in reversed(order):
+            coefficient = (1 + delta[node]) / sigma[node]
+            for pred in preds[node]:
+                delta[pred] += sigma[pred] * coefficient
+            if node != src:
+                betweenness[node] = betweenness.get(node, 0) + delta[node]
+    return betweenness
+
+
+def distances_of_sources(sources: list, adjacency: dict = None, queue_type=None) -> dict:
+    """
+    Sums the distances from the given sources into every node they reach.
+    Without adjacency it uses the one attached to the worker process.
+    @return: dictionary of node id to (sum of distances, number of sources that reach it)
+    """
+    if adjacency is None:
+        adjacency = shared["adjacency"]
+        queue_type = shared["queue_type"]
+    totals = {}
+    for src in sources:
+        dist = shortest_paths_dag(adjacency, src, queue_type)[1]
+        for node, path in dist.items():
+            if node != src:
+                total, count = totals.get(node, (0, 0))
+                totals[node] = (total + path, count + 1)
+    return totals
+
+
+def attach(adjacency: dict, queue_type) -> None:
+    """
+    Worker initializer, keeps the graph for every task of the pool.
+    @return: None
+    """
+    shared["adjacency"] = adjacency
+    shared["queue_type"] = queue_type
+
+
+def run_sources(function, adjacency: dict, sources: list, queue_type, workers: int) -> list:
+    """
+    Runs function over the sources, split in chunks over a pool of worker processes if workers > 0.
+    @return: list of the results of every chunk
+    """
+    if workers <= 0 or len(sources) < 2:
+        return [function(sources, adjacency, queue_type)]
+    chunk = -(-len(sources) // (workers * 4))
+    chunks = [sources[i:i + chunk] for i in range(0, len(sources), chunk)]
+    with Pool(workers, initializer=attach, initargs=(adjacency, queue_type)) as pool:
+        return pool.map(function, chunks)
+
+
+def pick_sources(keys: list, samples: int, seed: int) -> list:
+    """
+    Returns all the keys, or samples of them chosen uniformly at random without repetition.
+    """
+    if samples is None or samples >= len(keys):
+        return keys
+    # A private generator, the global random state of the caller is left alone
+    return rand.Random(seed).sample(keys, samples)
+
+
+def betweenness_centrality(graph: GraphInterface, normalized: bool = False, workers: int = 0, samples: int = None,
+                           seed: int = 0, queue_type=BinaryHeap) -> dict:
+    """
+    Brandes' betweenness centrality of every node of the weighted directed graph.
+    @param graph: The graph
+    @param normalized: If True the values are divided by (n - 1)(n - 2), the number of ordered pairs of other nodes
+    @param workers: The number of worker processes the sources are split over, 0 to run in this process
+    @param samples: If given only this many random sources are used and the sums are scaled by n / samples, an
+    unbiased estimate whose error is bounded by sampling_error
+    @param seed: The seed of the sampled sources
+    @param queue_type: The priority queue of the dijkstra runs
+    @return: dictionary of node id to betweenness
+    """
+    adjacency = adjacency_of(graph)
+    keys = list(adjacency)
+    sources = pick_sources(keys, samples, seed)
+    betweenness = dict.fromkeys(keys, 0)
+    for part in run_sources(betweenness_of_sources, adjacency, sources, queue_type, workers):
+        for node, value in part.items():
+            betweenness[node] += value
+    scale = len(keys) / len(sources) if sources else 1
+    if normalized and len(keys) > 2:
+        scale /= (len(keys) - 1) * (len(keys) - 2)
+    if scale != 1:
+        for node in betweenness:
+            betweenness[node] *= scale
+    return betweenness
+
+
+def closeness_centrality(graph: GraphInterface, workers: int = 0, samples: int = None, seed: int = 0,
+                         queue_type=BinaryHeap) -> dict:
+    """
+    Closeness centrality of every node, from the distances of the nodes that reach it (like networkx for directed
+    graphs), scaled by the part of the graph that reaches it (Wasserman and Faust) so unreachable nodes count:
+    closeness(v) = (r / total) * (r / (n - 1)), r the number of nodes that reach v and total their distances to v.
+    @param graph: The graph
+    @param workers: The number of worker processes the sources are split over, 0 to run in this process
+    @param samples: If given only this many random sources are used, r is scaled by (n - 1) / samples
+    (Eppstein and Wang estimate of the average distance)
+    @param seed: The seed of the sampled sources
+    @param queue_type: The priority queue of the dijkstra runs
+    @return: dictionary of node id to closeness
+    """
+    adjacency = adjacency_of(graph)
+    keys = list(adjacency)
+    sources = pick_sources(keys, samples, seed)
+    totals = {}
+    for part in run_sources(distances_of_sources, adjacency, sources, queue_type, workers):
+        for node, (total, count) in part.items():
+            old_total, old_count = totals.get(node, (0, 0))
+            totals[node] = (old_total + total, old_count + count)
+    closeness = dict.fromkeys(keys, 0.0)
+    if len(keys) < 2:
+        return closeness
+    scale = 1 if len(sources) == len(keys) else (len(keys) - 1) / len(sources)
+    for node, (total, count) in totals.items():
+        if total > 0:
+            reached = count * scale
+            closeness[node] = (count / total) * (reached / (len(keys) - 1))
+    return closeness
+
+
+def sampling_error(n: int, samples: int, confidence: float = 0.95) -> float:
+    """
+    Returns the error bound of sampled betweenness centrality: with probability confidence, every node's estimate
+    is within this distance of its exact value (Hoeffding's inequality with a union bound over the n nodes, every
+    source adds between 0 and n - 2 to a node).
+    @param n: The number of nodes
+    @param samples: The number of sampled sources
+    @param confidence: The probability the bound holds
+    @return: the bound, in the units of betweenness_centrality(normalized=False)
+    """
+    if n < 3 or samples <= 0:
+        return 0.0
+    epsilon = math.sqrt(math.log(2 * n / (1 - confidence)) / (2 * samples))
+    return epsilon * n * (n - 2)
+
+
+def samples_for_error(n: int, error: float, confidence: float = 0.95) -> int:
+    """
+    Returns the number of sampled sources that makes the normalized betweenness centrality error at most error.
+    @param n: The number of nodes
+    @param error: The wanted bound, in the units of betweenness_centrality(normalized=True)
+    @param confidence: The probability the bound holds
+    @return: the number of sources
+    """
+    if n < 3:
+        return n
+    # Normalized values divide by (n - 1)(n - 2), the sampling bound is epsilon * n * (n - 2)
+    epsilon = error * (n - 1) / n
+    return min(n, math.ceil(math.log(2 * n / (1 - confidence)) / (2 * epsilon * epsilon)))
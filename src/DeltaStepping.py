@@ -0,0 +1,229 @@
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from src.GraphInterface import GraphInterface
+import argparse
+import math
+import time
+
+# The shared arrays of the graph, attached once in every worker process by attach
+shared = {}
+
+
+def requests(nodes: list, light: bool, delta: float, offsets, targets, weights, dist) -> list:
+    """
+    Returns the relaxations that improve a distance, over the light (weight <= delta) or the heavy edges of nodes.
+    @return: list of (dest index, new distance, src index)
+    """
+    found = []
+    for src in nodes:
+        path = dist[src]
+        for edge in range(offsets[src], offsets[src + 1]):
+            weight = weights[edge]
+            if (weight <= delta) is light:
+                dest = targets[edge]
+                new_path = path + weight
+                if new_path < dist[dest]:
+                    found.append((dest, new_path, src))
+    return found
+
+
+def attach(names: dict) -> None:
+    """
+    Worker initializer, maps the shared memory blocks of the graph and the distances.
+    @param names: dictionary of array name to (shared memory name, typecode)
+    @return: None
+    """
+    for key, (name, typecode) in names.items():
+        block = SharedMemory(name=name)
+        shared[key + "_block"] = block
+        shared[key] = block.buf.cast(typecode)
+
+
+def worker_requests(task: tuple) -> list:
+    nodes, light, delta = task
+    return requests(nodes, light, delta, shared["offsets"], shared["targets"], shared["weights"], shared["dist"])
+
+
+class DeltaStepping:
+    """This class represents delta-stepping single source shortest paths over a read-only array copy of a graph.
+
+    The graph is copied once to compressed arrays (offsets, targets, weights) in shared memory. Nodes are kept in
+    buckets of width delta, every bucket is emptied by relaxing the light edges (weight <= delta) of its nodes until
+    none is added back, then the heavy edges of all the nodes it had. The relaxations of a bucket are found by a
+    process pool reading the shared arrays, the coordinator applies them, so the distances are the same as dijkstra.
+    Frontiers smaller than min_parallel are relaxed in this process, the pool only pays off on wide frontiers.
+    """
+
+    def __init__(self, graph: GraphInterface, workers: int = 0, delta: float = None, min_parallel: int = 2048):
+        """
+        Constructor, copies the graph to shared memory and starts the pool.
+        @param graph: The graph, later changes to it are not seen
+        @param workers: The number of worker processes, 0 to relax everything in this process
+        @param delta: The bucket width, if None it is tuned from the weights, see tune_delta
+        @param min_parallel: The smallest frontier handed to the pool
+        """
+        all_nodes = graph.get_all_v()
+        self.keys = list(all_nodes)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        size = len(self.keys)
+        edges = sum(len(graph.all_out_edges_of_node(key)) for key in self.keys)
+        # The real number of edges, the blocks are at least 8 bytes so an empty array has one unused element
+        self.edges = edges
+        self.blocks = []
+        self.arrays = {}
+        self.pool = None
+        try:
+            self.build(graph, size, edges, workers, delta)
+        except BaseException:
+            # Nothing may be left in /dev/shm by a constructor that failed
+            self.close()
+            raise
+        self.workers = workers
+        self.min_parallel = min_parallel
+
+    def build(self, graph: GraphInterface, size: int, edges: int, workers: int, delta: float) -> None:
+        """
+        Allocates the shared arrays, fills them from the graph, tunes delta and starts the pool.
+        @return: None
+        """
+        names = {}
+        for name, typecode, length in [("offsets", "q", size + 1), ("targets", "q", edges), ("weights", "d", edges),
+                                       ("dist", "d", size)]:
+            block = SharedMemory(create=True, size=max(8, 8 * length))
+            self.blocks.append(block)
+            self.arrays[name] = block.buf.cast(typecode)
+            names[name] = (block.name, typecode)
+        offsets = self.arrays["offsets"]
+        targets = self.arrays["targets"]
+        weights = self.arrays["weights"]
+        edge = 0
+        for i, key in enumerate(self.keys):
+            offsets[i] = edge
+            for dest, weight in graph.all_out_edges_of_node(key).items():
+                targets[edge] = self.index[dest]
+                weights[edge] = weight
+                edge += 1
+        offsets[size] = edge
+        self.delta = delta if delta is not None else self.tune_delta()
+        self.pool = Pool(workers, initializer=attach, initargs=(names,)) if workers > 0 else None
+
+    def tune_delta(self) -> float:
+        """
+        Picks the bucket width from the weights: max weight / average out degree, the Meyer-Sanders choice that
+        keeps the expected re-relaxations per node constant, but never below the lowest weight, so buckets are not
+        narrower than any edge and every light phase has work.
+        @return: the bucket width
+        """
+        if self.edges == 0:
+            return 1.0
+        degree = self.edges / len(self.keys)
+        # A released slice, so close can free the block
+        with self.arrays["weights"][:self.edges] as weights:
+            return max(min(weights), max(weights) / max(1.0, degree))
+
+    def find_requests(self, nodes: list, light: bool) -> list:
+        """
+        Finds the improving relaxations of the light or heavy edges of nodes, in the pool if there are enough nodes.
+        @return: list of (dest index, new distance, src index)
+        """
+        if self.pool is None or len(nodes) < self.min_parallel:
+            return requests(nodes, light, self.delta, self.arrays["offsets"], self.arrays["targets"],
+                            self.arrays["weights"], self.arrays["dist"])
+        chunk = -(-len(nodes) // (self.workers * 4))
+        tasks = [(nodes[i:i + chunk], light, self.delta) for i in range(0, len(nodes), chunk)]
+        found = []
+        for part in self.pool.map(worker_requests, tasks):
+            found.extend(part)
+        return found
+
+    def run(self, src: int) -> (dict, dict):
+        """
+        Computes the shortest distances from src.
+        @param src: The start node id
+        @return: dictionary of reachable node id to distance, dictionary of reachable node id to parent id
+        """
+        if src not in self.index:
+            return {}, {}
+        dist = self.arrays["dist"]
+        for i in range(len(dist)):
+            dist[i] = math.inf
+        delta = self.delta
+        parent = {}
+        start = self.index[src]
+        dist[start] = 0
+        parent[start] = start
+        buckets = {0: {start}}
+
+        def relax(found: list):
+            for dest, new_path, node in found:
+                old = dist[dest]
+                # Several requests can target one node, only the best one stays
+                if new_path < old:
+                    # The current bucket was already taken out of buckets, its nodes are not found there
+                    if old != math.inf and int(old // delta) in buckets:
+                        buckets[int(old // delta)].discard(dest)
+                    buckets.setdefault(int(new_path // delta), set()).add(dest)
+                    dist[dest] = new_path
+                    parent[dest] = node
+
+        while buckets:
+            i = min(buckets)
+            settled = set()
+            while buckets.get(i):
+                frontier = buckets.pop(i)
+                settled |= frontier
+                relax(self.find_requests(list(frontier), True))
+            buckets.pop(i, None)
+            relax(self.find_requests(list(settled), False))
+            # Buckets left empty by nodes that moved to a lower bucket
+            for empty in [key for key, nodes in buckets.items() if not nodes]:
+                del buckets[empty]
+
+        keys = self.keys
+        return {keys[i]: dist[i] for i in parent}, {keys[i]: keys[p] for i, p in parent.items()}
+
+    def close(self) -> None:
+        """
+        Stops the pool and frees the shared memory.
+        @return: None
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        for array in self.arrays.values():
+            array.release()
+        self.arrays = {}
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+if __name__ == '__main__':
+    from src.bench_queues import random_graph
+    from src.GraphAlgo import GraphAlgo
+    parser = argparse.ArgumentParser(description="Delta-stepping time by number of workers, against dijkstra")
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--edges", type=int, default=800000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    arguments = parser.parse_args()
+    graph_algo = GraphAlgo(random_graph(arguments.nodes, arguments.edges))
+    begin = time.perf_counter()
+    graph_algo.dijkstra(0)
+    base = time.perf_counter() - begin
+    expected = {key: node.tag for key, node in graph_algo.get_graph().get_all_v().items() if node.tag != math.inf}
+    print(f"dijkstra {base:.2f}s")
+    for count in arguments.workers:
+        with DeltaStepping(graph_algo.get_graph(), count) as stepping:
+            begin = time.perf_counter()
+            distances = stepping.run(0)[0]
+            elapsed = time.perf_counter() - begin
+        print(f"workers {count}: {elapsed:.2f}s, delta {stepping.delta:.3f}, speedup vs dijkstra {base / elapsed:.2f}, "
+              f"same distances {distances == expected}")
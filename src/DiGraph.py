@@ -1,6 +1,108 @@
 from src.NodeData import NodeData
+from src.UnionFind import UnionFind
+from hashlib import blake2b
 import copy
 
+# The fingerprint is a sum of 64 bit hashes, kept modulo 2^64
+FINGERPRINT_MASK = (1 << 64) - 1
+
+
+def number_hash(value) -> int:
+    """
+    Returns the python hash of an int or float. Unlike the hash of a str it is not randomized, the language defines
+    it (modulo sys.hash_info.modulus), so it is the same in every process, equal for 5 and 5.0 and works for ints of
+    any size. NaN, whose hash is not fixed, gets a constant.
+    """
+    return hash(value) if value == value else 0x7FF8
+
+
+def id_hash(node_id) -> int:
+    """
+    Returns a hash of a node id that is the same in every process, ids that are not numbers are hashed by their repr.
+    """
+    if isinstance(node_id, (int, float)):
+        return number_hash(node_id)
+    return int.from_bytes(blake2b(repr(node_id).encode(), digest_size=8).digest(), "little")
+
+
+def node_hash(node_id, pos) -> int:
+    """
+    Returns a 64 bit hash of a node that is the same in every process.
+    The hash of a tuple of numbers is not randomized and is computed in C, which keeps add_node cheap. The pos is
+    hashed as numbers, so a pos read back from json as floats hashes like the original one. A node without a pos
+    hashes an empty tuple, not None: before python 3.12 the hash of None is its address, different in every process.
+    Note: the value depends on the tuple hash of CPython, a fingerprint saved by one python implementation may not
+    match the one computed by another.
+    """
+    if pos is None:
+        pos = ()
+    else:
+        pos = tuple(pos)
+        # The sum is NaN only if a value is NaN (or the values are infinities of both signs), rare enough to be slow
+        total = sum(pos)
+        if total != total:
+            pos = tuple(number_hash(value) for value in pos)
+    if type(node_id) is not int:
+        node_id = id_hash(node_id)
+    return hash((0x4E4F4445, node_id, pos)) & FINGERPRINT_MASK
+
+
+def edge_hash(id1, id2, weight) -> int:
+    """
+    Returns a 64 bit hash of an edge that is the same in every process, the weight is hashed as a number so 5 and
+    5.0 hash the same. Int ids, the common case, go straight into one tuple hash.
+    """
+    if type(id1) is not int:
+        id1 = id_hash(id1)
+    if type(id2) is not int:
+        id2 = id_hash(id2)
+    if weight != weight:
+        weight = 0x7FF8
+    return hash((0x45444745, id1, id2, weight)) & FINGERPRINT_MASK
+
+
+def pos_from_json(pos) -> tuple:
+    """
+    Returns the pos of a node read from json as a tuple of 3 floats, pos is a list or a "x,y,z" string.
+    """
+    if pos is None:
+        return None
+    if type(pos) is str:
+        pos = pos.split(',')
+    x, y, z = pos
+    return float(x), float(y), float(z)
+
+
+def nodes_to_json(graph) -> (list, list):
+    """
+    Returns the "Nodes" and "Edges" lists of the json format of a graph, any GraphInterface.
+    """
+    all_nodes = graph.get_all_v()
+    list_of_nodes = []
+    # Put in the list of nodes the dictionary of every node, its id and pos
+    for key, node in all_nodes.items():
+        if node.pos is not None:
+            list_of_nodes.append({"id": key, "pos": node.pos})
+        else:
+            list_of_nodes.append({"id": key})
+    list_of_edges = []
+    # Put in the list of edges the dictionary of every edge, its src, dest and weight
+    for src_node in all_nodes:
+        for dest_node, weight in graph.all_out_edges_of_node(src_node).items():
+            list_of_edges.append({"src": src_node, "w": weight, "dest": dest_node})
+    return list_of_nodes, list_of_edges
+
+
+def nodes_from_json(graph, graph_dict: dict) -> None:
+    """
+    Adds to a graph the nodes and edges of a dictionary in the json format.
+    @return: None
+    """
+    for node_dict in graph_dict["Nodes"]:
+        graph.add_node(node_dict["id"], pos_from_json(node_dict.get("pos")))
+    for edge_dict in graph_dict["Edges"]:
+        graph.add_edge(edge_dict["src"], edge_dict["dest"], edge_dict["w"])
+
 
 class DiGraph:
     """This class represents a directed weighted graph with basic functions."""
@@ -15,12 +117,26 @@ class DiGraph:
             self.nodes_in_graph = {}
             self.edges_in_node = {}
             self.edges_out_node = {}
+            # Kept up to date by every change, None means not computed yet (see get_fingerprint)
+            self.fingerprint = 0
+            # The weakly connected components, None until the first query builds them (see get_weak_components), then
+            # kept up to date by add_node and add_edge. Graphs that are never asked do not pay for them
+            self.weak = None
+            # True after a removal: weak may still join components the removal split, it is rebuilt when exact
+            # components are asked for
+            self.weak_stale = False
+            # The original id of every node of a relabeled graph, None o.w.
+            self.original_ids = None
         elif isinstance(graph, DiGraph):
             self.mc = copy.deepcopy(graph.mc)
             self.edge_size = copy.deepcopy(graph.edge_size)
             self.nodes_in_graph = copy.deepcopy(graph.nodes_in_graph)
             self.edges_in_node = copy.deepcopy(graph.edges_in_node)
             self.edges_out_node = copy.deepcopy(graph.edges_out_node)
+            self.fingerprint = graph.fingerprint
+            self.weak = copy.deepcopy(graph.weak)
+            self.weak_stale = graph.weak_stale
+            self.original_ids = copy.copy(graph.original_ids)
 
     def v_size(self) -> int:
         """
@@ -70,6 +186,85 @@ class DiGraph:
         """
         return self.mc
 
+    def get_fingerprint(self) -> int:
+        """
+        Returns a 64 bit hash of the content of this graph (node ids, positions, edges and weights), kept up to date
+        on every change. Unlike the MC it only depends on the content: equal graphs have equal fingerprints in every
+        process and after a save and load, so it can be a cache key, and different fingerprints mean different graphs.
+        A graph built with fingerprint None (like load_from_json does) computes it here in one pass on the first call.
+        @return: The fingerprint of this graph
+        """
+        if self.fingerprint is None:
+            fingerprint = 0
+            for key, node in self.nodes_in_graph.items():
+                fingerprint += node_hash(key, node.pos)
+            for src, out_dict in self.edges_out_node.items():
+                for dest, weight in out_dict.items():
+                    fingerprint += edge_hash(src, dest, weight)
+            self.fingerprint = fingerprint & FINGERPRINT_MASK
+        return self.fingerprint
+
+    def get_weak_components(self) -> UnionFind:
+        """
+        Returns the weakly connected components of this graph (the components when edge directions are ignored).
+        They are built here in one pass over the edges on the first call and after a removal, and kept up to date by
+        add_node and add_edge in between.
+        @return: The UnionFind of the node ids
+        """
+        if self.weak is None or self.weak_stale:
+            weak = UnionFind()
+            for key in self.nodes_in_graph:
+                weak.add(key)
+            for src, out_dict in self.edges_out_node.items():
+                for dest in out_dict:
+                    weak.union(src, dest)
+            self.weak = weak
+            self.weak_stale = False
+        return self.weak
+
+    def weakly_connected(self, id1: int, id2: int) -> bool:
+        """
+        Returns True if id1 and id2 are in the same weakly connected component, in O(α(n)). False means there is no
+        path between them in either direction.
+        @param id1: The first node id
+        @param id2: The second node id
+        @return: True if they are connected ignoring edge directions, False o.w. or if one of them does not exist
+        """
+        return self.get_weak_components().connected(id1, id2)
+
+    def may_be_connected(self, id1: int, id2: int) -> bool:
+        """
+        Returns False if there is surely no path between id1 and id2 in either direction, without rebuilding the
+        weak components after a removal: removals only split components, so nodes in different components of the
+        stale union-find are still in different ones. True may be wrong after a removal.
+        @param id1: The first node id
+        @param id2: The second node id
+        @return: False if id1 and id2 are not weakly connected, True if they may be
+        """
+        if self.weak is None:
+            return self.weakly_connected(id1, id2)
+        return self.weak.connected(id1, id2)
+
+    def relabeled(self, order: list):
+        """
+        Returns a copy of this graph with the node order[i] renamed to i. The nodes and every adjacency dictionary
+        are created in the new id order, so a traversal that follows nearby ids also walks through nearby memory
+        (see src.Reorder for orders that put nodes close in the graph next to each other).
+        @param order: All the node ids of this graph, each once
+        @return: the new DiGraph, its original_ids is order so original_ids[new id] is the original id
+        """
+        new_ids = {key: i for i, key in enumerate(order)}
+        graph = DiGraph()
+        for key in order:
+            pos = self.nodes_in_graph[key].pos
+            graph.add_node(new_ids[key], pos)
+        for i, key in enumerate(order):
+            for dest in sorted(new_ids[dest] for dest in self.all_out_edges_of_node(key)):
+                graph.add_edge(i, dest, self.edges_out_node[key][order[dest]])
+        # Relabeling a relabeled graph maps straight back to the first ids
+        graph.original_ids = list(order) if self.original_ids is None else [self.original_ids[key] for key in order]
+        return graph
+
     def add_edge(self, id1: int, id2: int, weight: float) -> bool:
         """
         Adds an edge to the graph.
@@ -92,10 +287,18 @@ class DiGraph:
         if id1 in self.edges_in_node.get(id2):
             return False
         else:
+            # Hashed before anything changes, so a weight that can not be hashed leaves the graph as it was
+            # Order independent fingerprint, the sum of the hashes of all the nodes and edges
+            fingerprint = self.fingerprint
+            if fingerprint is not None:
+                fingerprint = (fingerprint + edge_hash(id1, id2, weight)) & FINGERPRINT_MASK
             # Add the key id1 and value weight as an inner dictionary, to the dictionary of edges_in_node of id2
             self.edges_in_node[id2][id1] = weight
             # Add the key id2 and value weight as an inner dictionary, to the dictionary of edges_out_node of id1
             self.edges_out_node[id1][id2] = weight
+            self.fingerprint = fingerprint
+            if self.weak is not None:
+                self.weak.union(id1, id2)
             # Increment mode counter and edge size by one, because an edge was added to the graph
             self.mc += 1
             self.edge_size += 1
@@ -113,9 +316,16 @@ class DiGraph:
         if node_id in self.nodes_in_graph:
             return False
         else:
+            # Hashed before anything changes, so a node that can not be hashed is not half added
+            fingerprint = self.fingerprint
+            if fingerprint is not None:
+                fingerprint = (fingerprint + node_hash(node_id, pos)) & FINGERPRINT_MASK
             # Add the key node_id and value pos (position of the node) as an inner dictionary,
             # to the dictionary nodes_in_graph and increment mode counter
             self.nodes_in_graph[node_id] = NodeData(node_id, pos)
+            self.fingerprint = fingerprint
+            if self.weak is not None:
+                self.weak.add(node_id)
             self.mc += 1
             return True
 
@@ -149,8 +359,15 @@ class DiGraph:
                 self.remove_edge(node_id, dest)
                 self.mc -= 1
 
+        # Drops the now empty edge dictionaries of node_id, so the graph equals one that never had the node
+        self.edges_in_node.pop(node_id, None)
+        self.edges_out_node.pop(node_id, None)
         # Deletes the node_id from the graph and increment mode counter by one
+        if self.fingerprint is not None:
+            self.fingerprint = (self.fingerprint - node_hash(node_id, self.nodes_in_graph[node_id].pos)) & \
+                               FINGERPRINT_MASK
         del self.nodes_in_graph[node_id]
+        self.weak_stale = True
         self.mc += 1
         return True
 
@@ -174,10 +391,15 @@ class DiGraph:
         if node_id1 not in self.edges_in_node.get(node_id2):
             return False
         else:
+            weight = self.edges_out_node[node_id1][node_id2]
+            if self.fingerprint is not None:
+                self.fingerprint = (self.fingerprint - edge_hash(node_id1, node_id2, weight)) & FINGERPRINT_MASK
             # Deletes the key node_id2 from the inner dictionary of edges_out_node of node_id1
             del self.edges_out_node[node_id1][node_id2]
             # Deletes the key node_id1 from the inner dictionary of edges_in_node of node_id2
             del self.edges_in_node[node_id2][node_id1]
+            # The union-find can not split a component, it is rebuilt when exact components are asked for
+            self.weak_stale = True
             # Increment mode counter by one and decrement edge size by one
             self.mc += 1
             self.edge_size -= 1
@@ -185,6 +407,9 @@ class DiGraph:
 
     def __eq__(self, other):
         if isinstance(other, DiGraph):
+            # Different fingerprints always mean different graphs, equal ones are confirmed by the full comparison
+            if self.get_fingerprint() != other.get_fingerprint():
+                return False
             return self.edge_size == other.edge_size and \
                    self.v_size() == other.v_size() and \
                    self.nodes_in_graph == other.nodes_in_graph and \
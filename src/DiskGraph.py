@@ -0,0 +1,241 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from src.GraphInterface import GraphInterface
+from src.NodeData import NodeData
+import argparse
+import sqlite3
+import time
+
+
+class NodeTable(Mapping):
+    """This class represents the nodes of a DiskGraph as a read-only dictionary of node id to NodeData.
+
+    The NodeData objects are created on every access from the database, changing them changes nothing.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, key):
+        row = self.graph.db.execute("SELECT x, y, z FROM nodes WHERE id = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return NodeData(key, None if row[0] is None else row)
+
+    def __contains__(self, key):
+        return self.graph.db.execute("SELECT 1 FROM nodes WHERE id = ?", (key,)).fetchone() is not None
+
+    def __iter__(self):
+        for row in self.graph.db.execute("SELECT id FROM nodes"):
+            yield row[0]
+
+    def __len__(self):
+        return self.graph.node_size
+
+    def items(self):
+        for key, x, y, z in self.graph.db.execute("SELECT id, x, y, z FROM nodes"):
+            yield key, NodeData(key, None if x is None else (x, y, z))
+
+
+class DiskGraph(GraphInterface):
+    """This class represents a directed weighted graph stored in a SQLite file, for graphs larger than the memory.
+
+    The edges are kept in one table indexed both by source and by destination, only the adjacency dictionaries of the
+    last cache_size nodes asked for (separately for out and in edges) are kept in memory, least recently used first
+    out. Changes are written to the database in a transaction that is committed by commit or close.
+    GraphAlgo works on it like on a DiGraph, shortest_path and connected_components only keep their own per query
+    state in memory.
+    """
+
+    def __init__(self, file_name: str, cache_size: int = 10000):
+        """
+        Constructor, opens the database or creates an empty graph in it.
+        @param file_name: The path to the SQLite file, ":memory:" for a temporary one
+        @param cache_size: The number of adjacency dictionaries kept in memory per direction
+        """
+        self.file_name = file_name
+        self.db = sqlite3.connect(file_name)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS nodes (id INTEGER PRIMARY KEY, x REAL, y REAL, z REAL);
+            CREATE TABLE IF NOT EXISTS edges (src INTEGER, dest INTEGER, w REAL, PRIMARY KEY (src, dest))
+                WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS edges_in ON edges (dest, src, w);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+        """)
+        meta = dict(self.db.execute("SELECT key, value FROM meta"))
+        self.mc = meta.get("mc", 0)
+        self.node_size = self.db.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+        self.edge_size = self.db.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+        self.cache_size = cache_size
+        self.out_cache = OrderedDict()
+        self.in_cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.nodes = NodeTable(self)
+
+    @staticmethod
+    def from_graph(graph: GraphInterface, file_name: str, cache_size: int = 10000):
+        """
+        Writes a graph to a new database file in one transaction.
+        @param graph: The graph to copy
+        @param file_name: The path to the SQLite file
+        @param cache_size: The number of adjacency dictionaries kept in memory per direction
+        @return: the DiskGraph of the file
+        """
+        disk = DiskGraph(file_name, cache_size)
+        disk.db.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?)",
+                            ((key, *(node.pos if node.pos is not None else (None, None, None)))
+                             for key, node in graph.get_all_v().items()))
+        disk.db.executemany("INSERT INTO edges VALUES (?, ?, ?)",
+                            ((src, dest, weight) for src in graph.get_all_v()
+                             for dest, weight in graph.all_out_edges_of_node(src).items()))
+        disk.node_size = graph.v_size()
+        disk.edge_size = graph.e_size()
+        disk.mc = graph.get_mc()
+        disk.commit()
+        return disk
+
+    def cached(self, cache: OrderedDict, id1: int, query: str) -> dict:
+        """
+        Returns the adjacency dictionary of id1 from the cache, or reads it and puts it in the cache.
+        """
+        edges = cache.get(id1)
+        if edges is not None:
+            self.hits += 1
+            cache.move_to_end(id1)
+            return edges
+        self.misses += 1
+        edges = dict(self.db.execute(query, (id1,)))
+        cache[id1] = edges
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return edges
+
+    def hit_rate(self) -> float:
+        """
+        Returns the part of the adjacency lookups that were answered from the cache.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def v_size(self) -> int:
+        return self.node_size
+
+    def e_size(self) -> int:
+        return self.edge_size
+
+    def get_all_v(self) -> dict:
+        return self.nodes
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        return self.cached(self.in_cache, id1, "SELECT src, w FROM edges WHERE dest = ?")
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        return self.cached(self.out_cache, id1, "SELECT dest, w FROM edges WHERE src = ?")
+
+    def get_mc(self) -> int:
+        return self.mc
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        if id1 == id2 or weight <= 0 or id1 not in self.nodes or id2 not in self.nodes:
+            return False
+        if self.db.execute("INSERT OR IGNORE INTO edges VALUES (?, ?, ?)", (id1, id2, weight)).rowcount == 0:
+            return False
+        # The cached dictionaries are updated in place, the ones not cached are read again when asked for
+        if id1 in self.out_cache:
+            self.out_cache[id1][id2] = weight
+        if id2 in self.in_cache:
+            self.in_cache[id2][id1] = weight
+        self.mc += 1
+        self.edge_size += 1
+        return True
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        row = (node_id, *(pos if pos is not None else (None, None, None)))
+        if self.db.execute("INSERT OR IGNORE INTO nodes VALUES (?, ?, ?, ?)", row).rowcount == 0:
+            return False
+        self.mc += 1
+        self.node_size += 1
+        return True
+
+    def remove_node(self, node_id: int) -> bool:
+        if node_id not in self.nodes:
+            return False
+        for src in list(self.all_in_edges_of_node(node_id)):
+            self.remove_edge(src, node_id)
+            self.mc -= 1
+        for dest in list(self.all_out_edges_of_node(node_id)):
+            self.remove_edge(node_id, dest)
+            self.mc -= 1
+        self.db.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
+        self.out_cache.pop(node_id, None)
+        self.in_cache.pop(node_id, None)
+        self.mc += 1
+        self.node_size -= 1
+        return True
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        if self.db.execute("DELETE FROM edges WHERE src = ? AND dest = ?", (node_id1, node_id2)).rowcount == 0:
+            return False
+        if node_id1 in self.out_cache:
+            self.out_cache[node_id1].pop(node_id2, None)
+        if node_id2 in self.in_cache:
+            self.in_cache[node_id2].pop(node_id1, None)
+        self.mc += 1
+        self.edge_size -= 1
+        return True
+
+    def commit(self) -> None:
+        """
+        Commits the changes since the last commit to the file.
+        @return: None
+        """
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('mc', ?)", (self.mc,))
+        self.db.commit()
+
+    def close(self) -> None:
+        """
+        Commits and closes the database.
+        @return: None
+        """
+        self.commit()
+        self.db.close()
+
+    def __repr__(self):
+        return f"|V|={self.v_size()} |E|={self.e_size()}"
+
+
+if __name__ == '__main__':
+    from src.bench_queues import random_graph
+    from src.GraphAlgo import GraphAlgo
+    import os
+    import random as rand
+    parser = argparse.ArgumentParser(description="Shortest path throughput and cache hit rate by cache size")
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--edges", type=int, default=400000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--file", default="bench_disk_graph.db")
+    arguments = parser.parse_args()
+    if os.path.exists(arguments.file):
+        os.remove(arguments.file)
+    graph = random_graph(arguments.nodes, arguments.edges)
+    DiskGraph.from_graph(graph, arguments.file).close()
+    generator = rand.Random(1)
+    pairs = [(generator.randrange(arguments.nodes), generator.randrange(arguments.nodes))
+             for _ in range(arguments.queries)]
+    graph_algo = GraphAlgo(graph)
+    begin = time.perf_counter()
+    for id1, id2 in pairs:
+        graph_algo.shortest_path(id1, id2)
+    print(f"in memory DiGraph: {len(pairs) / (time.perf_counter() - begin):.2f} queries/s")
+    del graph, graph_algo
+    for size in [1000, 10000, 50000, arguments.nodes]:
+        disk = DiskGraph(arguments.file, cache_size=size)
+        graph_algo = GraphAlgo(disk)
+        begin = time.perf_counter()
+        for id1, id2 in pairs:
+            graph_algo.shortest_path(id1, id2)
+        elapsed = time.perf_counter() - begin
+        print(f"cache {size}: {len(pairs) / elapsed:.2f} queries/s, hit rate {disk.hit_rate():.3f}")
+        disk.close()
+    os.remove(arguments.file)
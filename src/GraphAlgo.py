@@ -1,9 +1,16 @@
 from typing import List
 from src import GraphInterface
-from src.NodeData import NodeData
-from src.DiGraph import DiGraph
+from src.DiGraph import DiGraph, nodes_from_json, nodes_to_json
+from src.AlgoStats import AlgoStats
+from src.PriorityQueues import BinaryHeap
+from src.DeltaStepping import DeltaStepping
+from src.ReachabilityIndex import ReachabilityIndex
+from src.UnionFind import UnionFind
+from src.QueryLimit import CancelToken, Timeout, expired, CHECK_MASK
+from src import Centrality
+import itertools
 import math
-import heapq
+import time
 import json
 import random as rand
 import matplotlib.pyplot as plt
@@ -18,6 +25,28 @@ class GraphAlgo:
         @param graph: the graph of DiGraph
         """
         self.graph = graph
+        # The priority queue class dijkstra uses, any class of src.PriorityQueues (or a function returning one)
+        self.queue_type = BinaryHeap
+        # Instrumentation is off until enable_stats is called
+        self.stats = None
+        # Built on the first reachability query
+        self.reach_index = None
+
+    def enable_stats(self, callback=None) -> AlgoStats:
+        """
+        Turns on counters and timing for dijkstra, dijkstra_for_connected, load_from_json and save_to_json.
+        @param callback: optional function called as callback(op, elapsed, counters) after every recorded call
+        @return: the AlgoStats object that collects the stats
+        """
+        self.stats = AlgoStats(callback)
+        return self.stats
+
+    def disable_stats(self) -> None:
+        """
+        Turns off the instrumentation, the hot paths go back to not timing anything.
+        @return: None
+        """
+        self.stats = None
 
     def get_graph(self) -> GraphInterface:
         """
@@ -25,46 +54,46 @@ class GraphAlgo:
         """
         return self.graph
 
-    def load_from_json(self, file_name: str) -> bool:
+    def load_from_json(self, file_name: str, verify: bool = False) -> bool:
         """
         Loads a graph from a json file.
         @param file_name: The path to the json file
+        @param verify: If True a file saved with a fingerprint must hold the same graph it was saved with, so a file
+        edited or damaged after it was saved is refused. O.w. the fingerprint is ignored, edited files load as usual
         @returns True if the loading was successful, False o.w.
         """
 
         # If file is empty, return false
         if file_name is None:
             return False
+        stats = self.stats
+        if stats is not None:
+            start = time.perf_counter()
         # Read from json format file and load to graph
         try:
             with open(file_name, 'r') as file:
                 graph_dict = json.load(file)
         except FileNotFoundError:
             return False
+        if stats is not None:
+            parsed = time.perf_counter()
         graph = DiGraph()
-        nodes_list = graph_dict["Nodes"]
-        edges_list = graph_dict["Edges"]
-        # Loop over the nodes list from the json format
-        for node_dict in nodes_list:
-            # If pos does not exists in the dictionary of nodes from the nodes list, add only the id
-            if "pos" not in node_dict:
-                graph.add_node(node_dict["id"])
-            # If pos does exists in the dictionary of nodes from the nodes list, add id and pos
-            else:
-                list_of_pos = node_dict["pos"]
-                if type(list_of_pos) is str:
-                    x, y, z = list_of_pos.split(',')
-                else:
-                    x, y, z = list_of_pos
-                graph.add_node(node_dict["id"], (float(x), float(y), float(z)))
-
-        # Loop over the edges list from the json format
-        for edge_dict in edges_list:
-            # add an edge between src, dest and weight from the json format to the graph
-            graph.add_edge(edge_dict["src"], edge_dict["dest"], edge_dict["w"])
+        # The fingerprint is computed in one pass when first asked for, not updated on every node and edge loaded
+        graph.fingerprint = None
+        # Add the nodes and edges from the json format to the graph
+        nodes_from_json(graph, graph_dict)
 
+        # If asked, a file saved with a fingerprint must match it
+        if verify and "Fingerprint" in graph_dict and graph_dict["Fingerprint"] != graph.get_fingerprint():
+            return False
+        # A relabeled graph keeps the ids its nodes had before
+        graph.original_ids = graph_dict.get("OriginalIds")
         # Copy the updated graph to the original graph
         self.graph = graph
+        if stats is not None:
+            end = time.perf_counter()
+            stats.record("load_from_json", end - start, {"nodes": graph.v_size(), "edges": graph.e_size(),
+                                                         "parse_time": parsed - start, "build_time": end - parsed})
         return True
 
     def save_to_json(self, file_name: str) -> bool:
@@ -77,44 +106,36 @@ class GraphAlgo:
         # If file is empty, return false
         if file_name is None:
             return False
-        all_nodes = self.graph.get_all_v()
-        data = {}
-        list_of_nodes = []
-        # Loop over all the nodes in the graph
-        for key, node in all_nodes.items():
-            # Put in the dictionary of nodes the id and pos from json format
-            if node.pos is not None:
-                dict_of_nodes = {"id": key, "pos": node.pos}
-            else:
-                dict_of_nodes = {"id": key}
-            # Put in the list of nodes the dictionary of the nodes that contains the id and pos
-            list_of_nodes.append(dict_of_nodes)
-        # The dictionary data includes the key that contains Nodes from json format and in value the list of nodes
-        data["Nodes"] = list_of_nodes
-
-        list_of_edges = []
-        # Loop over all the nodes in the graph
-        for src_node in all_nodes:
-            out_edges = self.graph.all_out_edges_of_node(src_node)
-            # Loop over all the dest and weight of the out edges in the graph
-            for dest_node, weight in out_edges.items():
-                # Put in the dictionary of edges the src, dest and weight from json format
-                dict_of_edges = {"src": src_node, "w": weight, "dest": dest_node}
-                # Put in the dictionary of edges the dictionary of the edges that contains the src, dest and weight
-                list_of_edges.append(dict_of_edges)
-        # The dictionary data includes the key that contains Edges from json format and in value the list of edges
-        data["Edges"] = list_of_edges
+        stats = self.stats
+        if stats is not None:
+            start = time.perf_counter()
+        # The dictionary data includes the keys Nodes and Edges from json format, their values are the lists of nodes
+        # and edges
+        list_of_nodes, list_of_edges = nodes_to_json(self.graph)
+        data = {"Nodes": list_of_nodes, "Edges": list_of_edges}
+        # Save the fingerprint so load_from_json can check it got the same graph back
+        if isinstance(self.graph, DiGraph):
+            data["Fingerprint"] = self.graph.get_fingerprint()
+            if self.graph.original_ids is not None:
+                data["OriginalIds"] = self.graph.original_ids
         # Write the graph to a file in json format
         with open(file_name, 'w') as file:
             json.dump(data, file)
+        if stats is not None:
+            stats.record("save_to_json", time.perf_counter() - start,
+                         {"nodes": len(list_of_nodes), "edges": len(list_of_edges)})
         return True
 
-    def shortest_path(self, id1: int, id2: int) -> (float, list):
+    def shortest_path(self, id1: int, id2: int, deadline: float = None, cancel: CancelToken = None) -> (float, list):
         """
         Returns the shortest path from node id1 to node id2 using Dijkstra's Algorithm
         @param id1: The start node id
         @param id2: The end node id
-        @return: The distance of the path, a list of the nodes ids that the path goes through
+        @param deadline: optional time.monotonic() value to stop at, see src.QueryLimit.deadline_after
+        @param cancel: optional CancelToken that stops the query
+        @return: The distance of the path, a list of the nodes ids that the path goes through, or a Timeout whose
+        partial is the best (distance, path) found before it stopped ((inf, []) if none), not always the shortest.
+        If the search stopped after id2 was settled the exact answer is returned, not a Timeout
         Example:
 #      >>> from GraphAlgo import GraphAlgo
 #       >>> g_algo = GraphAlgo()
@@ -142,29 +163,82 @@ class GraphAlgo:
         # If id1 is equal to id2, returns distance of 0 and a list with one of the node ids
         if id1 is id2:
             return 0, [id2]
+        # Nodes in different weakly connected components have no path, no need to run dijkstra. The components are
+        # not rebuilt after a removal for this, they can only be too large and then dijkstra answers
+        if isinstance(self.graph, DiGraph) and not self.graph.may_be_connected(id1, id2):
+            return float('inf'), []
         # Using dijkstra algorithm with id1 to receive the distance of the shortest path
-        self.dijkstra(id1)
-        # If the tag of id2 node is equal to infinity it was not visited, returns distance of infinity and an empty list
-        if all_nodes[id2].tag is math.inf:
+        result = self.dijkstra(id1, tags=False, deadline=deadline, cancel=cancel)
+        if isinstance(result, Timeout):
+            dist, parent, radius = result.partial
+            # id2 was settled before the stop, its distance is final so the answer is exact
+            if id2 in dist and dist[id2] <= radius:
+                return dist[id2], self.path_to(id1, id2, parent)
+            # Every distance found is the length of a real path, the best one so far is the partial answer
+            if id2 in dist:
+                result.partial = dist[id2], self.path_to(id1, id2, parent)
+            else:
+                result.partial = float('inf'), []
+            return result
+        dist, parent = result
+        # If id2 has no distance it was not visited, returns distance of infinity and an empty list
+        if id2 not in dist:
             return float('inf'), []
 
+        return dist[id2], self.path_to(id1, id2, parent)
+
+    @staticmethod
+    def path_to(id1: int, id2: int, parent: dict) -> list:
+        """
+        Returns the path from id1 to id2 by the parents that dijkstra found.
+        @return: list of the nodes ids from id1 to id2
+        """
         # put in the shortest path list the node key of id2 (the dest node)
-        node = all_nodes[id2]
-        shortest_path = [node.key]
+        key = id2
+        shortest_path = [key]
         # Loop while have not reached id1 node key (the src node)
-        while node.key is not all_nodes[id1].key:
+        while key != id1:
             # Get the parent node and put the key in the shortest path list
-            node = all_nodes.get(node.parent)
-            shortest_path.append(node.key)
+            key = parent[key]
+            shortest_path.append(key)
         # Reverse the shortest path list to get from src to dest, that was inserted backwards
         shortest_path.reverse()
-        return all_nodes[id2].tag, shortest_path
+        return shortest_path
 
-    def connected_component(self, id1: int) -> list:
+    def get_reachability(self) -> ReachabilityIndex:
+        """
+        Returns the reachability index of the graph, built on the first call and whenever the graph is replaced,
+        the index itself rebuilds when the graph changes.
+        @return: the ReachabilityIndex of the graph
+        """
+        if self.reach_index is None or self.reach_index.graph is not self.graph:
+            self.reach_index = ReachabilityIndex(self.graph)
+        return self.reach_index
+
+    def is_reachable(self, id1: int, id2: int) -> bool:
+        """
+        Returns True if there is a path from node id1 to node id2, using the reachability index.
+        @param id1: The start node id
+        @param id2: The end node id
+        @return: True if id2 can be reached from id1, False o.w. or if one of them does not exist
+        """
+        return self.get_reachability().is_reachable(id1, id2)
+
+    def reachable_from(self, id1: int) -> list:
+        """
+        Returns all the nodes that can be reached from node id1 (id1 included), using the reachability index.
+        @param id1: The start node id
+        @return: list of node ids, empty if id1 does not exist
+        """
+        return self.get_reachability().reachable_from(id1)
+
+    def connected_component(self, id1: int, deadline: float = None, cancel: CancelToken = None) -> list:
         """
         Finds the Strongly Connected Component(SCC) that node id1 is a part of.
         @param id1: The node id
-        @return: The list of nodes in the SCC
+        @param deadline: optional time.monotonic() value to stop at, see src.QueryLimit.deadline_after
+        @param cancel: optional CancelToken that stops the query
+        @return: The list of nodes in the SCC, or a Timeout with no partial result if stopped
         Notes:
         If the graph is None or id1 is not in the graph, the function should return an empty list []
         """
@@ -179,10 +253,15 @@ class GraphAlgo:
             return connected
 
         # in_nodes list
-        in_nodes = self.dijkstra_for_connected(id1, True)
+        in_nodes = self.dijkstra_for_connected(id1, True, deadline, cancel)
+        if isinstance(in_nodes, Timeout):
+            return Timeout(in_nodes.reason)
         # out_nodes list
-        out_nodes = self.dijkstra_for_connected(id1, False)
+        out_nodes = self.dijkstra_for_connected(id1, False, deadline, cancel)
+        if isinstance(out_nodes, Timeout):
+            return Timeout(out_nodes.reason)
 
+        out_nodes = set(out_nodes)
         # Loop over the in_nodes list
         for key in in_nodes:
             # If the key of the copy_list is in the original list, then add the key to the connected list
@@ -190,10 +269,12 @@ class GraphAlgo:
                 connected.append(key)
         return connected
 
-    def connected_components(self) -> List[list]:
+    def connected_components(self, deadline: float = None, cancel: CancelToken = None) -> List[list]:
         """
         Finds all the Strongly Connected Component(SCC) in the graph.
-        @return: The list all SCC
+        @param deadline: optional time.monotonic() value to stop at, see src.QueryLimit.deadline_after
+        @param cancel: optional CancelToken that stops the query
+        @return: The list all SCC, or if stopped a Timeout whose partial is the list of the SCC found so far
         Notes:
         If the graph is None the function should return an empty list []
         """
@@ -210,12 +291,21 @@ class GraphAlgo:
 
         # Create a set of the nodes that were passed though in the graph
         check_set = set()
+        limited = deadline is not None or cancel is not None
         # Loop over all the node keys in the graph
         for key in all_nodes:
             # If the connected_components list is empty or if the key does not exists in the set,
             # then use connected_component function on the key and add it to a list of strongly connected nodes
             if not connected_components or key not in check_set:
-                connected_list = self.connected_component(key)
+                # The searches of small components may end before their own first check, so check between them too
+                if limited:
+                    reason = expired(deadline, cancel)
+                    if reason is not None:
+                        return Timeout(reason, connected_components)
+                connected_list = self.connected_component(key, deadline, cancel)
+                if isinstance(connected_list, Timeout):
+                    connected_list.partial = connected_components
+                    return connected_list
                 # If the strongly connected nodes list exists, then add to the final list
                 # the strongly connected nodes from the connected_list
                 if connected_list:
@@ -224,6 +314,46 @@ class GraphAlgo:
                     check_set |= set(connected_list)
         return connected_components
 
+    def weakly_connected_components(self) -> List[list]:
+        """
+        Finds all the weakly connected components in the graph (connected when edge directions are ignored), cheap
+        to split the graph into parts that share no paths.
+        @return: The list of all the weakly connected components
+        """
+        if self.graph is None:
+            return []
+        if isinstance(self.graph, DiGraph):
+            return self.graph.get_weak_components().components()
+        weak = UnionFind()
+        for key in self.graph.get_all_v():
+            weak.add(key)
+        for key in self.graph.get_all_v():
+            for dest in self.graph.all_out_edges_of_node(key):
+                weak.union(key, dest)
+        return weak.components()
+
+    def betweenness_centrality(self, normalized: bool = False, workers: int = 0, samples: int = None,
+                               seed: int = 0) -> dict:
+        """
+        Brandes' betweenness centrality of every node, with the dijkstra queue of this object.
+        @param normalized: If True the values are divided by (n - 1)(n - 2)
+        @param workers: The number of worker processes the sources are split over, 0 to run in this process
+        @param samples: If given, estimate from this many random sources, see Centrality.sampling_error
+        @param seed: The seed of the sampled sources
+        @return: dictionary of node id to betweenness
+        """
+        return Centrality.betweenness_centrality(self.graph, normalized, workers, samples, seed, self.queue_type)
+
+    def closeness_centrality(self, workers: int = 0, samples: int = None, seed: int = 0) -> dict:
+        """
+        Closeness centrality of every node from the distances into it, see Centrality.closeness_centrality.
+        @param workers: The number of worker processes the sources are split over, 0 to run in this process
+        @param samples: If given, estimate from this many random sources
+        @param seed: The seed of the sampled sources
+        @return: dictionary of node id to closeness
+        """
+        return Centrality.closeness_centrality(self.graph, workers, samples, seed, self.queue_type)
+
     def plot_graph(self) -> None:
         """
         Plots the graph.
@@ -284,50 +414,309 @@ class GraphAlgo:
         plt.title("Graph Plot")
         plt.show()
 
-    def dijkstra(self, src: int):
-        all_nodes = self.graph.get_all_v()
-        for key, node in all_nodes.items():
-            node.tag = math.inf
-            node.parent = 0
-        all_nodes.get(src).tag = 0
-        all_nodes.get(src).parent = src
-        queue = []
-        heapq.heappush(queue, all_nodes[src])
+    def dijkstra(self, src: int, queue=None, tags: bool = True, deadline: float = None,
+                 cancel: CancelToken = None) -> (dict, dict):
+        """
+        Runs Dijkstra's Algorithm from src, the distance of every node is put in its tag and the node it was reached
+        from in its parent (math.inf and 0 if it is not reachable).
+        @param src: The start node id
+        @param queue: optional priority queue to use instead of self.queue_type(), see src.PriorityQueues
+        @param tags: If False the nodes are not touched, only the returned dictionaries have the result
+        @param deadline: optional time.monotonic() value to stop at, see src.QueryLimit.deadline_after
+        @param cancel: optional CancelToken that stops the run
+        @return: dictionary of reachable node id to distance, dictionary of reachable node id to parent id, or if
+        stopped a Timeout (the tags are not written) whose partial is (dist, parent, radius): the distances found so
+        far are lengths of real paths, the ones <= radius are the final shortest distances
+        """
+        stats = self.stats
+        if stats is not None:
+            start = time.perf_counter()
+        # Plain local counters, only reported when stats are enabled
+        pushes = 1
+        pops = 0
+        stale = 0
+        scanned = 0
+        if queue is None:
+            queue = self.queue_type()
+        push = queue.push
+        pop = queue.pop
+        # Distances and parents are kept in local dictionaries while running and written to the nodes at the end
+        dist = {src: 0}
+        parent = {src: src}
+        out_edges = self.graph.all_out_edges_of_node
+        limited = deadline is not None or cancel is not None
+        timeout = None
+        push((0, src))
         while queue:
-            node: NodeData = heapq.heappop(queue)
-            edges = self.graph.all_out_edges_of_node(node.key)
+            path, key = pop()
+            pops += 1
+            # Without a limit this is a single local test, with one the clock is only read every CHECK_MASK + 1 pops
+            if limited and not pops & CHECK_MASK:
+                reason = expired(deadline, cancel)
+                if reason is not None:
+                    timeout = Timeout(reason, (dist, parent, path))
+                    break
+            # A node pushed again with a lower distance leaves its old entry behind, skip it
+            if path > dist[key]:
+                stale += 1
+                continue
+            edges = out_edges(key)
+            # Only counted for the stats, len is not free on the filtered dictionaries of a view
+            if stats is not None:
+                scanned += len(edges)
             for dest_key, weight in edges.items():
-                dest_node = all_nodes.get(dest_key)
-                path = node.tag + weight
-                if dest_node.tag is math.inf:
-                    dest_node.tag = path
-                    dest_node.parent = node.key
-                    heapq.heappush(queue, dest_node)
-                elif path < dest_node.tag:
-                    dest_node.tag = path
-                    dest_node.parent = node.key
-                    heapq.heappush(queue, dest_node)
-
-    def dijkstra_for_connected(self, src: int, flag=None):
+                new_path = path + weight
+                if new_path < dist.get(dest_key, math.inf):
+                    dist[dest_key] = new_path
+                    parent[dest_key] = key
+                    push((new_path, dest_key))
+                    pushes += 1
+        if tags and timeout is None:
+            for key, node in self.graph.get_all_v().items():
+                node.tag = dist.get(key, math.inf)
+                node.parent = parent.get(key, 0)
+        if stats is not None:
+            stats.record("dijkstra", time.perf_counter() - start,
+                         {"heap_pushes": pushes, "heap_pops": pops, "stale_pops": stale,
+                          "edges_relaxed": scanned, "edges_improved": pushes - 1, "nodes_settled": len(dist)})
+        if timeout is not None:
+            return timeout
+        return dist, parent
+
+    def iter_dijkstra(self, src: int, reverse: bool = False):
+        """
+        Lazy Dijkstra's Algorithm, yields the nodes in the order they are settled, nearest first.
+        The edges of a node are only relaxed when the next node is asked for, so stopping early skips the rest
+        of the graph. The queue must pop in exact order (see src.PriorityQueues).
+        @param src: The start node id
+        @param reverse: If True the in edges are followed, the distances are from the nodes to src
+        @return: generator of (node id, distance, parent id), src is its own parent
+        """
+        if src not in self.graph.get_all_v():
+            return
+        edges_of = self.graph.all_in_edges_of_node if reverse else self.graph.all_out_edges_of_node
+        queue = self.queue_type()
+        push = queue.push
+        pop = queue.pop
+        dist = {src: 0}
+        parent = {src: src}
+        settled = set()
+        push((0, src))
+        while queue:
+            path, key = pop()
+            if key in settled or path > dist[key]:
+                continue
+            settled.add(key)
+            yield key, path, parent[key]
+            for dest_key, weight in edges_of(key).items():
+                new_path = path + weight
+                if new_path < dist.get(dest_key, math.inf):
+                    dist[dest_key] = new_path
+                    parent[dest_key] = key
+                    push((new_path, dest_key))
+
+    def bfs(self, src: int, reverse: bool = False):
+        """
+        Breadth first traversal from src, ignoring the weights.
+        @param src: The start node id
+        @param reverse: If True the in edges are followed
+        @return: generator of (node id, number of edges from src, parent id), src is its own parent
+        """
+        if src not in self.graph.get_all_v():
+            return
+        edges_of = self.graph.all_in_edges_of_node if reverse else self.graph.all_out_edges_of_node
+        visited = {src}
+        level = [src]
+        depth = 0
+        yield src, 0, src
+        while level:
+            depth += 1
+            next_level = []
+            for key in level:
+                for dest_key in edges_of(key):
+                    if dest_key not in visited:
+                        visited.add(dest_key)
+                        next_level.append(dest_key)
+                        yield dest_key, depth, key
+            level = next_level
+
+    def dfs(self, src: int, reverse: bool = False):
+        """
+        Depth first traversal from src in pre-order, ignoring the weights.
+        @param src: The start node id
+        @param reverse: If True the in edges are followed
+        @return: generator of (node id, depth in the DFS tree, parent id), src is its own parent
+        """
+        if src not in self.graph.get_all_v():
+            return
+        edges_of = self.graph.all_in_edges_of_node if reverse else self.graph.all_out_edges_of_node
+        visited = {src}
+        yield src, 0, src
+        work = [(src, iter(edges_of(src)))]
+        while work:
+            key, edges = work[-1]
+            for dest_key in edges:
+                if dest_key not in visited:
+                    visited.add(dest_key)
+                    yield dest_key, len(work), key
+                    work.append((dest_key, iter(edges_of(dest_key))))
+                    break
+            else:
+                work.pop()
+
+    def nearest_nodes(self, src: int, count: int, reverse: bool = False) -> list:
+        """
+        Returns the count nearest nodes to src (src included), stopping the search as soon as they are found.
+        @param src: The start node id
+        @param count: The number of nodes
+        @param reverse: If True the distances are from the nodes to src
+        @return: list of (node id, distance, parent id), nearest first
+        """
+        return list(itertools.islice(self.iter_dijkstra(src, reverse), count))
+
+    def nodes_within(self, src: int, radius: float, reverse: bool = False) -> list:
+        """
+        Returns all the nodes at distance at most radius from src (src included), stopping the search at the first
+        node that is farther.
+        @param src: The start node id
+        @param radius: The largest distance
+        @param reverse: If True the distances are from the nodes to src
+        @return: list of (node id, distance, parent id), nearest first
+        """
+        return list(itertools.takewhile(lambda settled: settled[1] <= radius, self.iter_dijkstra(src, reverse)))
+
+    def multi_source_dijkstra(self, sources: list, reverse: bool = False) -> dict:
+        """
+        Runs Dijkstra's Algorithm from all the sources at once, every node ends up with its nearest source
+        (a graph Voronoi partition of the nodes between the sources).
+        @param sources: The node ids of the sources (depots), ids not in the graph are ignored
+        @param reverse: If False the distance is from the source to the node (over the out edges), if True it is
+        from the node to the source (over the in edges)
+        @return: dictionary of every reached node id to (nearest source, distance, parent), the parent is the node
+        before it on the path from the source (after it on the path to the source if reverse), a source is its own
+        parent
+        """
         all_nodes = self.graph.get_all_v()
-        for key, node in all_nodes.items():
-            node.tag = math.inf
-            node.parent = 0
-        all_nodes.get(src).tag = 0
-        visited = [all_nodes[src].key]
-        queue = [all_nodes[src]]
+        edges_of = self.graph.all_in_edges_of_node if reverse else self.graph.all_out_edges_of_node
+        queue = self.queue_type()
+        push = queue.push
+        pop = queue.pop
+        dist = {}
+        nearest = {}
+        for src in sources:
+            if src in all_nodes and src not in dist:
+                dist[src] = 0
+                nearest[src] = (src, 0, src)
+                push((0, src))
+        while queue:
+            path, key = pop()
+            if path > dist[key]:
+                continue
+            source = nearest[key][0]
+            for dest_key, weight in edges_of(key).items():
+                new_path = path + weight
+                if new_path < dist.get(dest_key, math.inf):
+                    dist[dest_key] = new_path
+                    nearest[dest_key] = (source, new_path, key)
+                    push((new_path, dest_key))
+        return nearest
+
+    def k_nearest_facilities(self, sources: list, k: int, reverse: bool = False) -> dict:
+        """
+        Finds for every node its k nearest sources, by one search where every node is settled at most once per
+        source and at most k times.
+        @param sources: The node ids of the sources (facilities), ids not in the graph are ignored
+        @param k: The number of sources to find per node
+        @param reverse: If False the distance is from the source to the node (over the out edges), if True it is
+        from the node to the source (over the in edges)
+        @return: dictionary of every reached node id to a list of up to k (source, distance), nearest first
+        Note: the first pop of a (node, source) pair is taken as final, so this always uses a BinaryHeap that pops in
+        exact order, not self.queue_type (a DialBuckets with other weights would give wrong distances)
+        """
+        all_nodes = self.graph.get_all_v()
+        edges_of = self.graph.all_in_edges_of_node if reverse else self.graph.all_out_edges_of_node
+        queue = BinaryHeap()
+        push = queue.push
+        pop = queue.pop
+        found = {}
+        # Settled sources per node, to skip a second entry of the same source
+        settled = {}
+        for src in set(sources):
+            if src in all_nodes:
+                push((0, (src, src)))
+        while queue:
+            path, (key, source) = pop()
+            node_sources = settled.setdefault(key, set())
+            if source in node_sources or len(node_sources) >= k:
+                continue
+            node_sources.add(source)
+            found.setdefault(key, []).append((source, path))
+            for dest_key, weight in edges_of(key).items():
+                dest_sources = settled.get(dest_key)
+                if dest_sources is None or (source not in dest_sources and len(dest_sources) < k):
+                    push((path + weight, (dest_key, source)))
+        return found
+
+    def delta_stepping(self, src: int, workers: int = 0, delta: float = None):
+        """
+        Same as dijkstra, but the distances are computed by delta-stepping with a pool of worker processes.
+        Worth it only for big graphs, for repeated queries keep a src.DeltaStepping object instead.
+        @param src: The start node id
+        @param workers: The number of worker processes, 0 to run in this process
+        @param delta: The bucket width, if None it is tuned from the weights
+        @return: None
+        """
+        with DeltaStepping(self.graph, workers, delta) as stepping:
+            dist, parent = stepping.run(src)
+        for key, node in self.graph.get_all_v().items():
+            node.tag = dist.get(key, math.inf)
+            node.parent = parent.get(key, 0)
+
+    def dijkstra_for_connected(self, src: int, flag=None, deadline: float = None, cancel: CancelToken = None):
+        """
+        Finds the nodes src reaches (flag True) or the nodes that reach src (flag False), by a DFS.
+        @param src: The start node id
+        @param flag: True to follow the out edges, False to follow the in edges
+        @param deadline: optional time.monotonic() value to stop at, see src.QueryLimit.deadline_after
+        @param cancel: optional CancelToken that stops the search
+        @return: list of the node ids found, src first, or if stopped a Timeout whose partial is the list found so far
+        """
+        stats = self.stats
+        if stats is not None:
+            start = time.perf_counter()
+        scanned = 0
+        steps = 0
+        limited = deadline is not None or cancel is not None
+        timeout = None
+        # A set of the visited nodes instead of tags, so the nodes of the graph are never touched
+        seen = {src}
+        visited = [src]
+        queue = [src]
         while queue:
-            node: NodeData = queue.pop()
+            key = queue.pop()
+            steps += 1
+            if limited and not steps & CHECK_MASK:
+                reason = expired(deadline, cancel)
+                if reason is not None:
+                    timeout = Timeout(reason, visited)
+                    break
             if flag:
-                edges = self.graph.all_out_edges_of_node(node.key)
+                edges = self.graph.all_out_edges_of_node(key)
             else:
-                edges = self.graph.all_in_edges_of_node(node.key)
-            for dest_key, weight in edges.items():
-                dest_node = all_nodes.get(dest_key)
-                if dest_node.tag is math.inf:
-                    dest_node.tag = 0
-                    visited.append(dest_node.key)
-                    queue.append(dest_node)
+                edges = self.graph.all_in_edges_of_node(key)
+            # Only counted for the stats, len is not free on the filtered dictionaries of a view
+            if stats is not None:
+                scanned += len(edges)
+            for dest_key in edges:
+                if dest_key not in seen:
+                    seen.add(dest_key)
+                    visited.append(dest_key)
+                    queue.append(dest_key)
+        if stats is not None:
+            stats.record("dijkstra_for_connected", time.perf_counter() - start,
+                         {"edges_scanned": scanned, "nodes_visited": len(visited)})
+        if timeout is not None:
+            return timeout
         return visited
 
     def get_min_max(self) -> (float, float, float, float, float, float):
@@ -0,0 +1,265 @@
+from src.DiGraph import DiGraph, nodes_from_json, nodes_to_json, pos_from_json
+from src.GraphInterface import GraphInterface
+import json
+import os
+
+
+class GraphJournal(GraphInterface):
+    """This class represents a graph persisted as a snapshot plus an append-only journal of its changes.
+
+    Every successful add_node, add_edge, remove_node, remove_edge and update_edge is appended to the journal as
+    one json line with an increasing sequence number, so saving costs O(changes) instead of rewriting the graph.
+    Every snapshot_every changes the graph is compacted: the snapshot (the save_to_json format plus the "Seq" it
+    covers) is rewritten and the journal is emptied. Recovery loads the snapshot and replays the journal lines whose
+    sequence number is after the snapshot, so a crash at any point between the two files is recovered.
+    """
+
+    def __init__(self, file_name: str, graph: DiGraph = None, snapshot_every: int = 10000, sync: bool = False):
+        """
+        Constructor
+        @param file_name: The path to the snapshot file, the journal is file_name + ".journal"
+        @param graph: A graph to start from, the files are overwritten with it. If None the graph is recovered from
+        the files, or empty if they do not exist
+        @param snapshot_every: The number of changes between compactions, 0 to compact only when compact is called
+        @param sync: If True every change is fsynced to disk, o.w. it is only flushed to the OS
+        """
+        self.file_name = file_name
+        self.journal_name = file_name + ".journal"
+        self.snapshot_every = snapshot_every
+        self.sync = sync
+        self.journal = None
+        if graph is None:
+            self.graph, self.seq, self.changes = GraphJournal.recover(file_name)
+            self.journal = open(self.journal_name, 'a')
+        else:
+            self.graph = graph
+            # The numbering goes on from the files being overwritten: the new snapshot covers every line of the old
+            # journal, so a crash before the journal is emptied does not replay the old changes on the new graph
+            self.seq = GraphJournal.last_seq(file_name)
+            self.changes = 0
+            self.compact()
+
+    @staticmethod
+    def recover(file_name: str) -> (DiGraph, int, int):
+        """
+        Loads the snapshot of file_name and replays its journal on top of it.
+        A torn last line (a crash in the middle of a write) is dropped from the journal, and so is a line that is not
+        valid json with everything after it: replay stops at the first bad line.
+        @param file_name: The path to the snapshot file
+        @return: the recovered graph, the sequence number of the last change in it, the number of replayed changes
+        """
+        graph = DiGraph()
+        seq = 0
+        try:
+            with open(file_name, 'r') as file:
+                graph_dict = json.load(file)
+        except FileNotFoundError:
+            graph_dict = None
+        if graph_dict is not None:
+            seq = graph_dict.get("Seq", 0)
+            nodes_from_json(graph, graph_dict)
+
+        journal_name = file_name + ".journal"
+        records, valid, size = GraphJournal.read_journal(journal_name)
+        replayed = 0
+        for record in records:
+            # Changes up to the snapshot sequence number are already in the snapshot
+            if record["seq"] <= seq:
+                continue
+            seq = record["seq"]
+            GraphJournal.apply(graph, record)
+            replayed += 1
+        if valid != size:
+            with open(journal_name, 'r+b') as file:
+                file.truncate(valid)
+        return graph, seq, replayed
+
+    @staticmethod
+    def read_journal(journal_name: str) -> (list, int, int):
+        """
+        Reads the records of a journal, up to its first bad line.
+        Only the last line can be torn by a crash, but a damaged line is treated the same way: nothing after it can
+        be trusted.
+        @param journal_name: The path to the journal
+        @return: the list of the valid records, the number of bytes they take, the size of the journal
+        """
+        try:
+            with open(journal_name, 'rb') as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            lines = []
+        records = []
+        valid = 0
+        for line in lines:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            records.append(record)
+            valid += len(line)
+        return records, valid, sum(len(line) for line in lines)
+
+    @staticmethod
+    def last_seq(file_name: str) -> int:
+        """
+        Returns the sequence number of the last change saved in the snapshot of file_name or its journal.
+        @param file_name: The path to the snapshot file
+        @return: the sequence number, 0 if there are no files
+        """
+        seq = 0
+        try:
+            with open(file_name, 'r') as file:
+                seq = json.load(file).get("Seq", 0)
+        except FileNotFoundError:
+            pass
+        for record in GraphJournal.read_journal(file_name + ".journal")[0]:
+            seq = max(seq, record["seq"])
+        return seq
+
+    @staticmethod
+    def apply(graph: DiGraph, record: dict) -> None:
+        """
+        Applies one journal record to the graph.
+        @return: None
+        """
+        op = record["op"]
+        if op == "add_node":
+            graph.add_node(record["id"], pos_from_json(record.get("pos")))
+        elif op == "remove_node":
+            graph.remove_node(record["id"])
+        elif op == "add_edge":
+            graph.add_edge(record["src"], record["dest"], record["w"])
+        elif op == "remove_edge":
+            graph.remove_edge(record["src"], record["dest"])
+        elif op == "update_edge":
+            graph.remove_edge(record["src"], record["dest"])
+            graph.add_edge(record["src"], record["dest"], record["w"])
+
+    def append(self, record: dict) -> None:
+        """
+        Writes one change to the journal and compacts when snapshot_every changes were written.
+        @return: None
+        """
+        self.seq += 1
+        record["seq"] = self.seq
+        self.journal.write(json.dumps(record) + "\n")
+        self.journal.flush()
+        if self.sync:
+            os.fsync(self.journal.fileno())
+        self.changes += 1
+        if self.snapshot_every and self.changes >= self.snapshot_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Rewrites the snapshot with the whole graph and empties the journal.
+        The snapshot is written to a temporary file and renamed over the old one, so there is always a complete
+        snapshot on disk, and it records the sequence number it covers so the old journal lines are skipped if the
+        crash comes before the journal is emptied.
+        @return: None
+        """
+        list_of_nodes, list_of_edges = nodes_to_json(self.graph)
+        data = {"Seq": self.seq, "Nodes": list_of_nodes, "Edges": list_of_edges}
+        temp_name = self.file_name + ".tmp"
+        with open(temp_name, 'w') as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_name, self.file_name)
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = open(self.journal_name, 'w')
+        self.changes = 0
+
+    def save(self) -> None:
+        """
+        Makes sure every change is on disk, the journal is already written on every change so this only fsyncs.
+        @return: None
+        """
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+    def close(self) -> None:
+        """
+        Saves and closes the journal, the graph can still be read but not changed anymore.
+        @return: None
+        """
+        if self.journal is not None:
+            self.save()
+            self.journal.close()
+            self.journal = None
+
+    def get_graph(self) -> DiGraph:
+        """
+        :return: the graph, change it only through the journal or the changes are not saved.
+        """
+        return self.graph
+
+    def v_size(self) -> int:
+        return self.graph.v_size()
+
+    def e_size(self) -> int:
+        return self.graph.e_size()
+
+    def get_all_v(self) -> dict:
+        return self.graph.get_all_v()
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        return self.graph.all_in_edges_of_node(id1)
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        return self.graph.all_out_edges_of_node(id1)
+
+    def get_mc(self) -> int:
+        return self.graph.get_mc()
+
+    def get_fingerprint(self) -> int:
+        return self.graph.get_fingerprint()
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        if not self.graph.add_edge(id1, id2, weight):
+            return False
+        self.append({"op": "add_edge", "src": id1, "dest": id2, "w": weight})
+        return True
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        if not self.graph.add_node(node_id, pos):
+            return False
+        if pos is None:
+            self.append({"op": "add_node", "id": node_id})
+        else:
+            self.append({"op": "add_node", "id": node_id, "pos": pos})
+        return True
+
+    def remove_node(self, node_id: int) -> bool:
+        if not self.graph.remove_node(node_id):
+            return False
+        self.append({"op": "remove_node", "id": node_id})
+        return True
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        if not self.graph.remove_edge(node_id1, node_id2):
+            return False
+        self.append({"op": "remove_edge", "src": node_id1, "dest": node_id2})
+        return True
+
+    def update_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """
+        Changes the weight of an existing edge.
+        @param id1: The start node of the edge
+        @param id2: The end node of the edge
+        @param weight: The new weight of the edge
+        @return: True if the weight was changed, False o.w.
+        Note: If the edge does not exist or the weight is not positive the function will do nothing
+        """
+        if weight <= 0 or id1 not in self.graph.all_in_edges_of_node(id2):
+            return False
+        self.graph.remove_edge(id1, id2)
+        self.graph.add_edge(id1, id2, weight)
+        self.append({"op": "update_edge", "src": id1, "dest": id2, "w": weight})
+        return True
+
+    def __repr__(self):
+        return f"{self.graph!r} seq={self.seq}"
@@ -0,0 +1,223 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.GraphAlgo import GraphAlgo
+import argparse
+import asyncio
+import json
+import random as rand
+
+# The most node ids one sample_nodes answer carries, so every response line stays small
+MAX_SAMPLE = 10000
+
+
+class GraphService:
+    """This class represents an asyncio query service that loads a graph once and answers JSON-lines queries.
+
+    Every request is one json line {"id": ..., "op": ..., "args": [...]} and gets one json line back,
+    {"id": ..., "result": ...} or {"id": ..., "error": ...}. Supported ops are shortest_path, connected_component,
+    connected_components, sample_nodes and info. Distances of unreachable nodes are sent as Infinity, like json.dumps does.
+    """
+
+    def __init__(self, graph_algo: GraphAlgo):
+        """
+        Constructor
+        @param graph_algo: the GraphAlgo with the loaded graph, the service only reads it
+        """
+        self.graph_algo = graph_algo
+        # connected_component and the stats of GraphAlgo are not thread safe, so the computations run one at a time
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        # In flight computations, concurrent queries with the same key wait on the same future
+        self.single_source = {}
+        self.components = {}
+        self.all_components = None
+        self.computations = 0
+
+    async def shortest_path(self, id1: int, id2: int) -> (float, list):
+        """
+        Returns the shortest path from node id1 to node id2, same result as GraphAlgo.shortest_path.
+        Concurrent queries from the same id1 share one dijkstra run.
+        @param id1: The start node id
+        @param id2: The end node id
+        @return: The distance of the path, a list of the nodes ids that the path goes through
+        """
+        all_nodes = self.graph_algo.get_graph().get_all_v()
+        if id1 not in all_nodes or id2 not in all_nodes:
+            return float('inf'), []
+        if id1 == id2:
+            return 0, [id2]
+        dist, parent = await self.coalesce(self.single_source, id1, self.run_dijkstra)
+        if id2 not in dist:
+            return float('inf'), []
+        # Walk the parents back from id2 to id1 and reverse
+        node = id2
+        path = [node]
+        while node != id1:
+            node = parent[node]
+            path.append(node)
+        path.reverse()
+        return dist[id2], path
+
+    async def connected_component(self, id1: int) -> list:
+        """
+        Returns the Strongly Connected Component that node id1 is a part of, same result as
+        GraphAlgo.connected_component. Concurrent queries of the same id1 share one computation.
+        @param id1: The node id
+        @return: The list of nodes in the SCC
+        """
+        return await self.coalesce(self.components, id1, self.graph_algo.connected_component)
+
+    async def connected_components(self) -> list:
+        """
+        Returns all the Strongly Connected Components in the graph, computed once and kept since the graph
+        does not change while it is served.
+        @return: The list all SCC
+        """
+        if self.all_components is None:
+            self.all_components = asyncio.get_running_loop().run_in_executor(self.executor,
+                                                                              self.graph_algo.connected_components)
+            self.computations += 1
+        return await asyncio.shield(self.all_components)
+
+    async def coalesce(self, in_flight: dict, key, func):
+        """
+        Runs func(key) in the executor unless a run of the same key is already in flight, then waits on that run.
+        @param in_flight: dictionary of key to the future of its running computation
+        @param key: the argument of func
+        @param func: the blocking function to run
+        @return: the result of func(key)
+        """
+        future = in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, func, key)
+            in_flight[key] = future
+            self.computations += 1
+            # Forget the future once it is done, so the next query after it starts a fresh run
+            future.add_done_callback(lambda done: in_flight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def run_dijkstra(self, src: int) -> (dict, dict):
+        """
+        Runs dijkstra from src, its own dictionaries stay valid while the next computations run.
+        @param src: The start node id
+        @return: dictionary of reachable node id to distance, dictionary of reachable node id to parent id
+        """
+        return self.graph_algo.dijkstra(src, tags=False)
+
+    def sample_nodes(self, k: int, seed: int = None) -> list:
+        """
+        Returns up to k node ids chosen at random without repetition, at most MAX_SAMPLE of them.
+        @param k: The number of node ids
+        @param seed: optional seed to get the same sample again
+        @return: list of node ids
+        """
+        keys = list(self.graph_algo.get_graph().get_all_v())
+        return rand.Random(seed).sample(keys, max(0, min(k, MAX_SAMPLE, len(keys))))
+
+    async def handle_request(self, request: dict) -> dict:
+        """
+        Answers one decoded request, every request gets exactly one response, errors included.
+        @param request: dictionary with id, op and args
+        @return: the response dictionary
+        """
+        if not isinstance(request, dict):
+            return {"id": None, "error": "request must be a json object"}
+        op = request.get("op")
+        args = request.get("args", [])
+        try:
+            if op == "shortest_path":
+                dist, path = await self.shortest_path(*args)
+                result = [dist, path]
+            elif op == "connected_component":
+                result = await self.connected_component(*args)
+            elif op == "connected_components":
+                result = await self.connected_components()
+            elif op == "sample_nodes":
+                result = self.sample_nodes(*args)
+            elif op == "info":
+                graph = self.graph_algo.get_graph()
+                result = {"v_size": graph.v_size(), "e_size": graph.e_size(), "mc": graph.get_mc()}
+            else:
+                return {"id": request.get("id"), "error": f"unknown op {op}"}
+        except TypeError as error:
+            return {"id": request.get("id"), "error": str(error)}
+        except Exception as error:
+            # Any other failure is still answered, the client waits for one line per request
+            return {"id": request.get("id"), "error": f"{type(error).__name__}: {error}"}
+        return {"id": request.get("id"), "result": result}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Reads request lines from one client, every line is answered by its own task so requests on the same
+        connection are pipelined and the answers may come back out of order, matched by their id.
+        @return: None
+        """
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self.answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def answer(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        """
+        Decodes one request line, answers it and writes the response line.
+        @return: None
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            response = {"id": None, "error": "invalid json"}
+        else:
+            response = await self.handle_request(request)
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def start(self, host: str = None, port: int = None, path: str = None) -> asyncio.AbstractServer:
+        """
+        Starts listening on a unix socket if path is given, on host:port o.w.
+        @return: the asyncio server
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path=path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self) -> None:
+        """
+        Shuts down the executor.
+        @return: None
+        """
+        self.executor.shutdown(wait=False)
+
+
+async def serve(file_name: str, host: str = "127.0.0.1", port: int = 8765, path: str = None) -> None:
+    """
+    Loads the graph from a json file and serves it until cancelled.
+    @param file_name: The path to the json file
+    @return: None
+    """
+    graph_algo = GraphAlgo()
+    if not graph_algo.load_from_json(file_name):
+        raise FileNotFoundError(file_name)
+    service = GraphService(graph_algo)
+    server = await service.start(host, port, path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve graph queries as json lines over a socket")
+    parser.add_argument("file", help="json graph file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="unix socket path, used instead of host and port")
+    arguments = parser.parse_args()
+    asyncio.run(serve(arguments.file, arguments.host, arguments.port, arguments.unix))
@@ -0,0 +1,211 @@
+from collections.abc import ItemsView, Mapping
+from src.GraphInterface import GraphInterface
+
+
+class FilteredDict(Mapping):
+    """This class represents a read-only view of a dictionary that only shows the pairs accepted by a filter."""
+
+    def __init__(self, data: dict, accept):
+        """
+        Constructor
+        @param data: The dictionary to show, it is not copied
+        @param accept: function accept(key, value) -> bool, True if the pair is shown
+        """
+        self.data = data
+        self.accept = accept
+
+    def __getitem__(self, key):
+        value = self.data[key]
+        if not self.accept(key, value):
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return key in self.data and self.accept(key, self.data[key])
+
+    def __iter__(self):
+        for key, value in self.data.items():
+            if self.accept(key, value):
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __bool__(self):
+        # Without it truth tests fall back to __len__, which counts every pair
+        for _ in self:
+            return True
+        return False
+
+    def items(self):
+        return FilteredItems(self)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class FilteredItems(ItemsView):
+    """The items of a FilteredDict, iterated in one pass over the dictionary instead of a lookup per key."""
+
+    def __iter__(self):
+        accept = self._mapping.accept
+        for key, value in self._mapping.data.items():
+            if accept(key, value):
+                yield key, value
+
+
+class KeyFilteredDict(FilteredDict):
+    """A FilteredDict whose filter only looks at the keys, iterated by the builtin filter instead of a generator."""
+
+    def __init__(self, data: dict, key_filter):
+        """
+        Constructor
+        @param data: The dictionary to show, it is not copied
+        @param key_filter: function key_filter(key) -> bool, True if the pair is shown
+        """
+        self.data = data
+        self.key_filter = key_filter
+
+    def accept(self, key, value) -> bool:
+        return self.key_filter(key)
+
+    def __contains__(self, key):
+        return key in self.data and self.key_filter(key)
+
+    def __iter__(self):
+        return filter(self.key_filter, self.data)
+
+
+class GraphView(GraphInterface):
+    """This class represents a read-only view of another graph, it shows the graph as is without copying it.
+
+    The views below change what is shown, they can be stacked (a view of a view) and GraphAlgo can run on them.
+    Changes to the viewed graph are seen by the view, the mutating functions of a view do nothing and return False.
+    Sizes that need counting are cached until get_mc() of the viewed graph changes.
+    """
+
+    def __init__(self, graph: GraphInterface):
+        """
+        Constructor
+        @param graph: The graph to view
+        """
+        self.graph = graph
+        self.sizes_mc = None
+        self.sizes = None
+
+    def v_size(self) -> int:
+        return self.graph.v_size()
+
+    def e_size(self) -> int:
+        return self.graph.e_size()
+
+    def get_all_v(self) -> dict:
+        return self.graph.get_all_v()
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        return self.graph.all_in_edges_of_node(id1)
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        return self.graph.all_out_edges_of_node(id1)
+
+    def get_mc(self) -> int:
+        return self.graph.get_mc()
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        return False
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        return False
+
+    def remove_node(self, node_id: int) -> bool:
+        return False
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        return False
+
+    def count_sizes(self) -> (int, int):
+        """
+        Counts the nodes and edges shown by the view, cached until the viewed graph changes
+        @return: The number of vertices, the number of edges
+        """
+        if self.sizes is None or self.sizes_mc != self.graph.get_mc():
+            all_nodes = self.get_all_v()
+            nodes = 0
+            edges = 0
+            for key in all_nodes:
+                nodes += 1
+                edges += len(self.all_out_edges_of_node(key))
+            self.sizes = nodes, edges
+            self.sizes_mc = self.graph.get_mc()
+        return self.sizes
+
+    def __repr__(self):
+        return f"|V|={self.v_size()} |E|={self.e_size()}"
+
+
+class NodeFilterView(GraphView):
+    """This class represents the induced subgraph of the nodes accepted by a filter, and the edges between them."""
+
+    def __init__(self, graph: GraphInterface, node_filter):
+        """
+        Constructor
+        @param graph: The graph to view
+        @param node_filter: function node_filter(node_id) -> bool, or a set (any container) of the node ids to show
+        """
+        super().__init__(graph)
+        if not callable(node_filter):
+            node_filter = node_filter.__contains__
+        self.node_filter = node_filter
+
+    def v_size(self) -> int:
+        return self.count_sizes()[0]
+
+    def e_size(self) -> int:
+        return self.count_sizes()[1]
+
+    def get_all_v(self) -> dict:
+        return KeyFilteredDict(self.graph.get_all_v(), self.node_filter)
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        if id1 not in self.graph.get_all_v() or not self.node_filter(id1):
+            return {}
+        return KeyFilteredDict(self.graph.all_in_edges_of_node(id1), self.node_filter)
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        if id1 not in self.graph.get_all_v() or not self.node_filter(id1):
+            return {}
+        return KeyFilteredDict(self.graph.all_out_edges_of_node(id1), self.node_filter)
+
+
+class EdgeFilterView(GraphView):
+    """This class represents all the nodes of a graph with only the edges whose weight is accepted by a filter."""
+
+    def __init__(self, graph: GraphInterface, weight_filter):
+        """
+        Constructor
+        @param graph: The graph to view
+        @param weight_filter: function weight_filter(weight) -> bool, True if the edge is shown
+        """
+        super().__init__(graph)
+        self.weight_filter = weight_filter
+
+    def e_size(self) -> int:
+        return self.count_sizes()[1]
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        weight_filter = self.weight_filter
+        return FilteredDict(self.graph.all_in_edges_of_node(id1), lambda key, weight: weight_filter(weight))
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        weight_filter = self.weight_filter
+        return FilteredDict(self.graph.all_out_edges_of_node(id1), lambda key, weight: weight_filter(weight))
+
+
+class ReversedView(GraphView):
+    """This class represents a graph with the direction of every edge flipped."""
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        return self.graph.all_out_edges_of_node(id1)
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        return self.graph.all_in_edges_of_node(id1)
@@ -1,6 +1,9 @@
 class NodeData:
     """This class represents a node data of the graph with simple functions."""
 
+    # Fixed attribute slots instead of a per-instance __dict__, nodes are the bulk of a large graph's memory
+    __slots__ = ("key", "pos", "parent", "tag")
+
     def __init__(self, key, pos=None):
         self.key = key
         self.pos = pos
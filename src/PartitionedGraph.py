@@ -0,0 +1,208 @@
+from multiprocessing import Pipe, Process
+from src.DiGraph import DiGraph
+import heapq
+import math
+
+
+def partition_by_id(graph: DiGraph, k: int) -> dict:
+    """
+    Splits the nodes of the graph into k shards of contiguous id ranges with about the same number of nodes.
+    @param graph: The graph to split
+    @param k: The number of shards
+    @return: dictionary of node id to shard index
+    """
+    keys = sorted(graph.get_all_v())
+    return {key: i * k // len(keys) for i, key in enumerate(keys)}
+
+
+def partition_by_pos(graph: DiGraph, k: int) -> dict:
+    """
+    Splits the nodes of the graph into k shards by recursive coordinate bisection of their pos, alternating
+    between x and y, so every shard is a compact region and fewer edges cross between shards.
+    If a node has no pos the graph is split by id ranges instead.
+    @param graph: The graph to split
+    @param k: The number of shards
+    @return: dictionary of node id to shard index
+    """
+    all_nodes = graph.get_all_v()
+    if any(node.pos is None for node in all_nodes.values()):
+        return partition_by_id(graph, k)
+    shards = {}
+
+    def bisect(keys: list, first: int, parts: int, axis: int):
+        if parts == 1:
+            for key in keys:
+                shards[key] = first
+            return
+        left_parts = parts // 2
+        keys.sort(key=lambda node_id: (all_nodes[node_id].pos[axis], node_id))
+        cut = len(keys) * left_parts // parts
+        bisect(keys[:cut], first, left_parts, 1 - axis)
+        bisect(keys[cut:], first + left_parts, parts - left_parts, 1 - axis)
+
+    bisect(list(all_nodes), 0, k, 0)
+    return shards
+
+
+def shard_worker(conn, out_edges: dict) -> None:
+    """
+    The loop of one shard process. It owns the out edges of its nodes and the dijkstra state of the current query.
+    Commands are tuples received on conn:
+    ("relax", seeds, target, bound) runs dijkstra from the seeds (node, dist, parent) over the local nodes and sends
+    back the candidate distances of remote nodes and the distance of target if it is local.
+    ("trace", node) sends back the path from node back up to a node whose parent is remote or is the source.
+    ("reset",) clears the state for a new query, ("close",) ends the process.
+    @param conn: The connection to the coordinator
+    @param out_edges: dictionary of local node id to its out edges dictionary (dest, weight)
+    @return: None
+    """
+    dist = {}
+    parent = {}
+    # Best distance already sent per remote node, to not send the same or worse candidate again
+    sent = {}
+    while True:
+        command = conn.recv()
+        if command[0] == "relax":
+            _, seeds, target, bound = command
+            queue = []
+            for node, path, prev in seeds:
+                if path < dist.get(node, math.inf):
+                    dist[node] = path
+                    parent[node] = prev
+                    heapq.heappush(queue, (path, node))
+            remote = {}
+            while queue:
+                path, node = heapq.heappop(queue)
+                # Stale entry, or nothing beyond the bound can improve the target
+                if path > dist[node] or path >= bound:
+                    continue
+                for dest, weight in out_edges[node].items():
+                    new_path = path + weight
+                    if dest in out_edges:
+                        if new_path < dist.get(dest, math.inf):
+                            dist[dest] = new_path
+                            parent[dest] = node
+                            heapq.heappush(queue, (new_path, dest))
+                    elif new_path < sent.get(dest, math.inf):
+                        sent[dest] = new_path
+                        remote[dest] = (dest, new_path, node)
+            conn.send((list(remote.values()), dist.get(target, math.inf)))
+        elif command[0] == "trace":
+            node = command[1]
+            segment = [node]
+            # Walk back while the parent is local and node is not the source (the source is its own parent)
+            while parent[node] != node and parent[node] in out_edges:
+                node = parent[node]
+                segment.append(node)
+            conn.send((segment, parent[node] if parent[node] != node else None))
+        elif command[0] == "reset":
+            dist = {}
+            parent = {}
+            sent = {}
+        elif command[0] == "close":
+            conn.close()
+            return
+
+
+class PartitionedGraph:
+    """This class represents a graph split into shards, every shard runs in its own process.
+
+    shortest_path runs dijkstra inside every shard and exchanges the distances of boundary nodes (the ends of edges
+    that cross between shards) through the coordinator until no shard can improve any distance, so the distances
+    are the same as GraphAlgo.shortest_path.
+    """
+
+    def __init__(self, graph: DiGraph, k: int, method: str = "id"):
+        """
+        Constructor, splits the graph and starts the shard processes.
+        @param graph: The graph to split, it is not changed and later changes to it are not seen
+        @param k: The number of shards
+        @param method: "id" to split by id ranges, "pos" to split by node positions
+        """
+        if method == "pos":
+            self.shard_of = partition_by_pos(graph, k)
+        elif method == "id":
+            self.shard_of = partition_by_id(graph, k)
+        else:
+            raise ValueError(f"unknown partition method {method}")
+        self.k = k
+        shard_edges = [{} for _ in range(k)]
+        for key, shard in self.shard_of.items():
+            shard_edges[shard][key] = dict(graph.all_out_edges_of_node(key))
+        # Number of edges whose ends are in different shards
+        self.cut_size = sum(1 for edges in shard_edges for src in edges for dest in edges[src]
+                            if dest not in edges)
+        self.conns = []
+        self.processes = []
+        for edges in shard_edges:
+            conn, child_conn = Pipe()
+            process = Process(target=shard_worker, args=(child_conn, edges), daemon=True)
+            process.start()
+            child_conn.close()
+            self.conns.append(conn)
+            self.processes.append(process)
+
+    def shortest_path(self, id1: int, id2: int) -> (float, list):
+        """
+        Returns the shortest path from node id1 to node id2, computed across the shards.
+        @param id1: The start node id
+        @param id2: The end node id
+        @return: The distance of the path, a list of the nodes ids that the path goes through
+        Notes:
+        If there is no path between id1 and id2, or one of them dose not exist the function returns (float('inf'),[])
+        """
+        if id1 not in self.shard_of or id2 not in self.shard_of:
+            return float('inf'), []
+        if id1 == id2:
+            return 0, [id2]
+        for conn in self.conns:
+            conn.send(("reset",))
+        bound = math.inf
+        pending = {self.shard_of[id1]: [(id1, 0, id1)]}
+        # Each round every shard with new boundary distances relaxes them, until no shard has anything new
+        while pending:
+            for shard, seeds in pending.items():
+                self.conns[shard].send(("relax", seeds, id2, bound))
+            updates = []
+            for shard in pending:
+                remote, target_dist = self.conns[shard].recv()
+                updates.extend(remote)
+                bound = min(bound, target_dist)
+            pending = {}
+            for update in updates:
+                if update[1] < bound:
+                    pending.setdefault(self.shard_of[update[0]], []).append(update)
+        if bound == math.inf:
+            return float('inf'), []
+        # Follow the parents back from id2, one shard segment at a time
+        path = []
+        node = id2
+        while node is not None:
+            conn = self.conns[self.shard_of[node]]
+            conn.send(("trace", node))
+            segment, node = conn.recv()
+            path.extend(segment)
+        path.reverse()
+        return bound, path
+
+    def close(self) -> None:
+        """
+        Stops the shard processes.
+        @return: None
+        """
+        for conn, process in zip(self.conns, self.processes):
+            if process.is_alive():
+                conn.send(("close",))
+            conn.close()
+            process.join()
+        self.conns = []
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"|V|={len(self.shard_of)} shards={self.k} cut edges={self.cut_size}"
@@ -0,0 +1,202 @@
+from functools import partial
+import heapq
+import struct
+
+
+class BinaryHeap:
+    """This class represents a binary heap of (priority, node_id) tuples on top of heapq.
+
+    A node whose priority decreases is pushed again, the old entry stays in the heap and is skipped when popped.
+    push and pop are the heapq functions bound to the list, so they cost no python call of their own.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.push = partial(heapq.heappush, self.heap)
+        self.pop = partial(heapq.heappop, self.heap)
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class IndexedHeap:
+    """This class represents a binary heap that keeps the index of every node in it, so pushing a node that is
+    already in the heap decreases its priority in place and the heap never holds stale entries."""
+
+    def __init__(self):
+        self.priorities = []
+        self.items = []
+        self.index = {}
+
+    def push(self, entry: tuple) -> None:
+        """
+        Inserts the node, or decreases its priority if it is already in the heap.
+        @param entry: tuple (priority, node_id)
+        @return: None
+        """
+        priority, item = entry
+        i = self.index.get(item)
+        if i is None:
+            i = len(self.items)
+            self.priorities.append(priority)
+            self.items.append(item)
+        elif priority >= self.priorities[i]:
+            return
+        self.sift_up(i, priority, item)
+
+    def pop(self) -> tuple:
+        """
+        Removes the node with the lowest priority.
+        @return: tuple (priority, node_id)
+        """
+        priorities = self.priorities
+        items = self.items
+        top = priorities[0], items[0]
+        del self.index[items[0]]
+        last_priority = priorities.pop()
+        last_item = items.pop()
+        if items:
+            self.sift_down(0, last_priority, last_item)
+        return top
+
+    def sift_up(self, i: int, priority, item) -> None:
+        priorities = self.priorities
+        items = self.items
+        index = self.index
+        while i > 0:
+            up = (i - 1) >> 1
+            if priorities[up] <= priority:
+                break
+            priorities[i] = priorities[up]
+            items[i] = items[up]
+            index[items[i]] = i
+            i = up
+        priorities[i] = priority
+        items[i] = item
+        index[item] = i
+
+    def sift_down(self, i: int, priority, item) -> None:
+        priorities = self.priorities
+        items = self.items
+        index = self.index
+        size = len(items)
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and priorities[child + 1] < priorities[child]:
+                child += 1
+            if priority <= priorities[child]:
+                break
+            priorities[i] = priorities[child]
+            items[i] = items[child]
+            index[items[i]] = i
+            i = child
+        priorities[i] = priority
+        items[i] = item
+        index[item] = i
+
+    def __len__(self):
+        return len(self.items)
+
+
+class RadixHeap:
+    """This class represents a radix heap, a monotone priority queue: a pushed priority must not be lower than the
+    last popped one, which always holds in dijkstra with non negative weights.
+
+    Priorities are non negative numbers, they are compared by the bits of their IEEE 754 double representation
+    (which keeps the order of non negative doubles). Bucket b holds the entries whose bits first differ from the
+    last popped priority at bit b - 1, so every entry moves down the buckets at most 64 times.
+    """
+
+    def __init__(self):
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+
+    def push(self, entry: tuple) -> None:
+        """
+        Inserts the node, a node whose priority decreases is pushed again and the old entry is popped later.
+        @param entry: tuple (priority, node_id), priority not lower than the last popped one
+        @return: None
+        """
+        code = struct.unpack("<Q", struct.pack("<d", entry[0]))[0]
+        self.buckets[(code ^ self.last).bit_length()].append((code, entry))
+        self.size += 1
+
+    def pop(self) -> tuple:
+        """
+        Removes the node with the lowest priority.
+        @return: tuple (priority, node_id)
+        """
+        buckets = self.buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bucket = buckets[i]
+            buckets[i] = []
+            # The new last is the minimum of the first non empty bucket, all its entries move to lower buckets
+            last = min(bucket)[0]
+            self.last = last
+            for code_entry in bucket:
+                buckets[(code_entry[0] ^ last).bit_length()].append(code_entry)
+        self.size -= 1
+        return buckets[0].pop()[1]
+
+    def __len__(self):
+        return self.size
+
+
+class DialBuckets:
+    """This class represents Dial's bucket queue, the priorities are grouped in buckets of width quantum and the
+    buckets are scanned in order, a push and a pop cost O(1) plus the empty buckets skipped.
+
+    It is exact when every weight is a multiple of quantum (all the entries of a bucket have the same priority).
+    With other weights the entries of one bucket pop in any order, dijkstra still ends with the right distances
+    because a node whose distance decreases later is pushed and relaxed again, at the cost of extra relaxations.
+    """
+
+    def __init__(self, quantum: float = 1):
+        """
+        Constructor
+        @param quantum: The bucket width, the step of the edge weights
+        """
+        self.quantum = quantum
+        self.buckets = {}
+        self.cursor = 0
+        self.size = 0
+
+    def push(self, entry: tuple) -> None:
+        """
+        Inserts the node, a node whose priority decreases is pushed again and the old entry is popped later.
+        @param entry: tuple (priority, node_id)
+        @return: None
+        """
+        # round, so a sum of quantized weights that is a little off the grid still lands in its own bucket
+        i = round(entry[0] / self.quantum)
+        bucket = self.buckets.get(i)
+        if bucket is None:
+            self.buckets[i] = [entry]
+        else:
+            bucket.append(entry)
+        if self.size == 0 or i < self.cursor:
+            self.cursor = i
+        self.size += 1
+
+    def pop(self) -> tuple:
+        """
+        Removes a node of the lowest non empty bucket.
+        @return: tuple (priority, node_id)
+        """
+        buckets = self.buckets
+        bucket = buckets.get(self.cursor)
+        while not bucket:
+            buckets.pop(self.cursor, None)
+            self.cursor += 1
+            bucket = buckets.get(self.cursor)
+        self.size -= 1
+        return bucket.pop()
+
+    def __len__(self):
+        return self.size
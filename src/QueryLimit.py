@@ -0,0 +1,59 @@
+import time
+
+# The limited loops check their deadline and cancel token once every CHECK_MASK + 1 steps
+CHECK_MASK = 1023
+
+
+def deadline_after(seconds: float) -> float:
+    """
+    Returns the deadline that is seconds from now, on the time.monotonic clock the queries compare with.
+    """
+    return time.monotonic() + seconds
+
+
+class CancelToken:
+    """This class represents a flag that stops the queries it was passed to, set from any thread by cancel."""
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """
+        Asks the queries to stop, they return a Timeout at their next check.
+        @return: None
+        """
+        self.cancelled = True
+
+
+class Timeout:
+    """This class represents the result of a query stopped by its deadline or its cancel token.
+
+    It is falsy, so "if not result" catches it like an empty result. reason is "deadline" or "cancelled" and partial is
+    what the query found before it stopped, described by every query that can return a Timeout.
+    """
+
+    __slots__ = ("reason", "partial")
+
+    def __init__(self, reason: str, partial=None):
+        self.reason = reason
+        self.partial = partial
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return f"Timeout({self.reason})"
+
+
+def expired(deadline: float = None, cancel: CancelToken = None) -> str:
+    """
+    Returns why a query must stop now, None if it can go on.
+    @param deadline: time.monotonic() value after which the query stops, None for no deadline
+    @param cancel: token that stops the query once it is cancelled, None for no token
+    @return: "cancelled", "deadline" or None
+    """
+    if cancel is not None and cancel.cancelled:
+        return "cancelled"
+    if deadline is not None and time.monotonic() >= deadline:
+        return "deadline"
+    return None
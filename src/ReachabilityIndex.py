@@ -0,0 +1,276 @@
+from src.GraphInterface import GraphInterface
+import argparse
+import random as rand
+import time
+
+
+class ReachabilityIndex:
+    """This class represents an index that answers "can id1 reach id2?" without running dijkstra.
+
+    The graph is condensed into the DAG of its Strongly Connected Components. Tarjan's algorithm numbers the
+    components so that a component only reaches components with a lower number, which answers many queries alone.
+    Every component also gets interval labels:
+    a pre/post interval of one DFS spanning tree, nested intervals prove that id1 reaches id2,
+    and GRAIL intervals of a few random DFS orders, an interval that is not nested proves that id1 can not reach id2.
+    Queries left open by the labels run a DFS over the DAG that is pruned by the same labels.
+    The index is rebuilt on the next query after get_mc() of the graph changes.
+    """
+
+    def __init__(self, graph: GraphInterface, traversals: int = 2, seed: int = 0):
+        """
+        Constructor, builds the index.
+        @param graph: The graph to index
+        @param traversals: The number of random GRAIL traversals, more traversals prune more queries
+        @param seed: The seed of the random traversal orders
+        """
+        self.graph = graph
+        self.traversals = traversals
+        self.seed = seed
+        self.build()
+
+    def build(self) -> None:
+        """
+        Builds the components, the DAG and the labels from the current graph.
+        @return: None
+        """
+        self.mc = self.graph.get_mc()
+        self.component = self.strongly_connected()
+        count = len(self.members)
+        children = [set() for _ in range(count)]
+        for key, comp in self.component.items():
+            for dest in self.graph.all_out_edges_of_node(key):
+                if self.component[dest] != comp:
+                    children[comp].add(self.component[dest])
+        self.children = [list(nodes) for nodes in children]
+        self.tree = self.intervals(list(range(count - 1, -1, -1)), self.children, tree=True)
+        # A private generator, the global random state of the caller is left alone
+        generator = rand.Random(self.seed)
+        self.labels = []
+        for _ in range(self.traversals):
+            roots = list(range(count))
+            generator.shuffle(roots)
+            shuffled = [generator.sample(nodes, len(nodes)) for nodes in self.children]
+            self.labels.append(self.intervals(roots, shuffled, tree=False))
+
+    def strongly_connected(self) -> dict:
+        """
+        Tarjan's algorithm without recursion. A component is numbered only after every component it reaches,
+        the members of every component are put in self.members.
+        @return: dictionary of node id to component number
+        """
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        component = {}
+        self.members = []
+        counter = 0
+        out_edges = self.graph.all_out_edges_of_node
+        for root in self.graph.get_all_v():
+            if root in index:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(out_edges(root)))]
+            while work:
+                node, edges = work[-1]
+                pushed = False
+                for dest in edges:
+                    if dest not in index:
+                        index[dest] = low[dest] = counter
+                        counter += 1
+                        stack.append(dest)
+                        on_stack.add(dest)
+                        work.append((dest, iter(out_edges(dest))))
+                        pushed = True
+                        break
+                    if dest in on_stack and index[dest] < low[node]:
+                        low[node] = index[dest]
+                if pushed:
+                    continue
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                # node is the root of a component, pop it and everything above it
+                if low[node] == index[node]:
+                    comp = len(self.members)
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component[member] = comp
+                        members.append(member)
+                        if member == node:
+                            break
+                    self.members.append(members)
+        return component
+
+    @staticmethod
+    def intervals(roots: list, children: list, tree: bool) -> list:
+        """
+        Labels the DAG components by one DFS from roots in the given order.
+        With tree=True the label of a component is the (pre, post) of the DFS spanning tree, nested only for the
+        descendants in the tree. With tree=False it is the GRAIL (low, post), with low the lowest post of everything
+        the component reaches, so the label of everything it reaches is nested in it.
+        @return: list of (low, high) per component
+        """
+        labels = [None] * len(children)
+        counter = 0
+        for root in roots:
+            if labels[root] is not None:
+                continue
+            labels[root] = (counter, None)
+            work = [(root, iter(children[root]), counter)]
+            counter += 1
+            while work:
+                comp, nodes, low = work[-1]
+                pushed = False
+                for child in nodes:
+                    if labels[child] is None:
+                        labels[child] = (counter, None)
+                        work.append((child, iter(children[child]), counter))
+                        counter += 1
+                        pushed = True
+                        break
+                    if not tree and labels[child][1] is not None and labels[child][0] < low:
+                        low = labels[child][0]
+                        work[-1] = (comp, nodes, low)
+                if pushed:
+                    continue
+                work.pop()
+                if tree:
+                    labels[comp] = (labels[comp][0], counter)
+                else:
+                    labels[comp] = (low, counter)
+                    if work and low < work[-1][2]:
+                        work[-1] = (work[-1][0], work[-1][1], low)
+                counter += 1
+        return labels
+
+    def check(self) -> None:
+        """
+        Rebuilds the index if the graph changed since it was built.
+        @return: None
+        """
+        if self.graph.get_mc() != self.mc:
+            self.build()
+
+    def may_reach(self, comp1: int, comp2: int) -> bool:
+        """
+        Returns False if the labels prove that component comp1 can not reach component comp2, True o.w.
+        """
+        if comp1 < comp2:
+            return False
+        for labels in self.labels:
+            low1, high1 = labels[comp1]
+            low2, high2 = labels[comp2]
+            if low2 < low1 or high2 > high1:
+                return False
+        return True
+
+    def is_reachable(self, id1: int, id2: int) -> bool:
+        """
+        Returns True if there is a path from node id1 to node id2 (every node reaches itself).
+        @param id1: The start node id
+        @param id2: The end node id
+        @return: True if id2 can be reached from id1, False o.w. or if one of them does not exist
+        """
+        self.check()
+        comp1 = self.component.get(id1)
+        comp2 = self.component.get(id2)
+        if comp1 is None or comp2 is None:
+            return False
+        if comp1 == comp2:
+            return True
+        if not self.may_reach(comp1, comp2):
+            return False
+        pre1, post1 = self.tree[comp1]
+        pre2, post2 = self.tree[comp2]
+        if pre1 <= pre2 and post2 <= post1:
+            return True
+        # The labels could not decide, search the DAG and skip every branch the labels rule out
+        visited = {comp1}
+        work = [comp1]
+        while work:
+            comp = work.pop()
+            for child in self.children[comp]:
+                if child == comp2:
+                    return True
+                if child not in visited and self.may_reach(child, comp2):
+                    visited.add(child)
+                    work.append(child)
+        return False
+
+    def reachable_from(self, id1: int) -> list:
+        """
+        Returns all the nodes that can be reached from node id1, id1 included.
+        @param id1: The start node id
+        @return: list of node ids, empty if id1 does not exist
+        """
+        self.check()
+        comp1 = self.component.get(id1)
+        if comp1 is None:
+            return []
+        visited = {comp1}
+        work = [comp1]
+        reachable = []
+        while work:
+            comp = work.pop()
+            reachable.extend(self.members[comp])
+            for child in self.children[comp]:
+                if child not in visited:
+                    visited.add(child)
+                    work.append(child)
+        return reachable
+
+    def component_of(self, id1: int) -> list:
+        """
+        Returns the Strongly Connected Component that node id1 is a part of.
+        @param id1: The node id
+        @return: The list of nodes in the SCC, empty if id1 does not exist
+        """
+        self.check()
+        comp = self.component.get(id1)
+        if comp is None:
+            return []
+        return self.members[comp]
+
+    def size(self) -> int:
+        """
+        Returns the number of integers stored by the index: a component per node, the DAG edges and two per label.
+        """
+        return len(self.component) + sum(len(nodes) for nodes in self.children) + \
+            2 * len(self.members) * (1 + len(self.labels))
+
+    def __repr__(self):
+        return f"|V|={len(self.component)} |SCC|={len(self.members)} " \
+               f"|DAG E|={sum(len(nodes) for nodes in self.children)}"
+
+
+if __name__ == '__main__':
+    from src.bench_queues import random_graph
+    from src.GraphAlgo import GraphAlgo
+    parser = argparse.ArgumentParser(description="Build time, size and query time of the reachability index")
+    parser.add_argument("--queries", type=int, default=10000)
+    arguments = parser.parse_args()
+    graphs = []
+    for file in ["../data/A5", "../data/G_1000_8000_1.json"]:
+        algo = GraphAlgo()
+        algo.load_from_json(file)
+        graphs.append((file, algo.get_graph()))
+    graphs.append(("random 100k/150k", random_graph(100000, 150000)))
+    graphs.append(("random 100k/800k", random_graph(100000, 800000)))
+    for name, graph in graphs:
+        begin = time.perf_counter()
+        index = ReachabilityIndex(graph)
+        built = time.perf_counter() - begin
+        keys = list(graph.get_all_v())
+        generator = rand.Random(1)
+        pairs = [(generator.choice(keys), generator.choice(keys)) for _ in range(arguments.queries)]
+        begin = time.perf_counter()
+        reached = sum(index.is_reachable(id1, id2) for id1, id2 in pairs)
+        query = (time.perf_counter() - begin) / len(pairs)
+        print(f"{name}: {index}, build {built:.3f}s, size {index.size()} ints, "
+              f"query {query * 1e6:.1f}us, reachable {reached}/{len(pairs)}")
@@ -0,0 +1,166 @@
+from src.DiGraph import DiGraph
+import argparse
+import random as rand
+import time
+
+# The Hilbert curve of hilbert_order runs over a 2^16 x 2^16 grid
+HILBERT_SIDE = 1 << 16
+
+
+def degrees(graph: DiGraph) -> dict:
+    """
+    Returns the number of in and out edges of every node.
+    """
+    return {key: len(graph.all_out_edges_of_node(key)) + len(graph.all_in_edges_of_node(key))
+            for key in graph.get_all_v()}
+
+
+def rcm_order(graph: DiGraph) -> list:
+    """
+    Orders the nodes by reverse Cuthill-McKee: a BFS that ignores edge directions, starting every component from a
+    node of lowest degree and visiting the neighbours of a node by increasing degree, then reversed.
+    Nodes close in the graph get close positions, so traversals touch nearby ids.
+    @param graph: The graph
+    @return: list of all the node ids in the new order
+    """
+    degree = degrees(graph)
+    order = []
+    visited = set()
+    for root in sorted(degree, key=degree.get):
+        if root in visited:
+            continue
+        visited.add(root)
+        head = len(order)
+        order.append(root)
+        # order doubles as the BFS queue, head is the next node to expand
+        while head < len(order):
+            key = order[head]
+            head += 1
+            neighbours = [dest for dest in graph.all_out_edges_of_node(key) if dest not in visited]
+            neighbours += [src for src in graph.all_in_edges_of_node(key) if src not in visited]
+            for dest in sorted(set(neighbours), key=degree.get):
+                visited.add(dest)
+                order.append(dest)
+    order.reverse()
+    return order
+
+
+def degree_order(graph: DiGraph) -> list:
+    """
+    Orders the nodes by decreasing degree, so the hubs that most traversals go through are next to each other.
+    @param graph: The graph
+    @return: list of all the node ids in the new order
+    """
+    degree = degrees(graph)
+    return sorted(degree, key=lambda key: -degree[key])
+
+
+def hilbert_index(x: int, y: int) -> int:
+    """
+    Returns the position of the grid cell (x, y) along the Hilbert curve of a HILBERT_SIDE x HILBERT_SIDE grid.
+    """
+    index = 0
+    side = HILBERT_SIDE // 2
+    while side > 0:
+        rx = 1 if x & side else 0
+        ry = 1 if y & side else 0
+        index += side * side * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the curve inside it starts and ends next to its neighbours
+        if ry == 0:
+            if rx == 1:
+                x = HILBERT_SIDE - 1 - x
+                y = HILBERT_SIDE - 1 - y
+            x, y = y, x
+        side //= 2
+    return index
+
+
+def hilbert_order(graph: DiGraph) -> list:
+    """
+    Orders the nodes along a Hilbert curve over the x and y of their pos, so nodes close in space get close
+    positions. If a node has no pos the nodes are ordered by rcm_order instead.
+    @param graph: The graph
+    @return: list of all the node ids in the new order
+    """
+    all_nodes = graph.get_all_v()
+    if any(node.pos is None for node in all_nodes.values()):
+        return rcm_order(graph)
+    if not all_nodes:
+        return []
+    xs = [node.pos[0] for node in all_nodes.values()]
+    ys = [node.pos[1] for node in all_nodes.values()]
+    min_x, min_y = min(xs), min(ys)
+    scale = (HILBERT_SIDE - 1) / max(max(xs) - min_x, max(ys) - min_y, 1e-12)
+
+    def cell(key):
+        pos = all_nodes[key].pos
+        return hilbert_index(int((pos[0] - min_x) * scale), int((pos[1] - min_y) * scale)), key
+
+    return sorted(all_nodes, key=cell)
+
+
+ORDERS = {"rcm": rcm_order, "degree": degree_order, "hilbert": hilbert_order}
+
+
+def reorder(graph: DiGraph, method: str = "rcm") -> DiGraph:
+    """
+    Returns a copy of the graph with its nodes renumbered 0..n-1 in the order of method, see DiGraph.relabeled.
+    @param graph: The graph
+    @param method: "rcm", "degree" or "hilbert"
+    @return: the relabeled graph, its original_ids maps the new ids back
+    """
+    return graph.relabeled(ORDERS[method](graph))
+
+
+def shuffled_grid(side: int, seed: int = 0) -> DiGraph:
+    """
+    Creates a side x side grid with edges both ways between neighbours, its node ids are a random permutation and
+    the nodes are added in random order, like ids that come from an upstream system.
+    """
+    # A private generator, the random module of the caller is not reseeded
+    generator = rand.Random(seed)
+    ids = list(range(side * side))
+    generator.shuffle(ids)
+    graph = DiGraph()
+    for cell in generator.sample(range(side * side), side * side):
+        graph.add_node(ids[cell], (float(cell % side), float(cell // side), 0.0))
+    for cell in generator.sample(range(side * side), side * side):
+        x, y = cell % side, cell // side
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            if 0 <= x + dx < side and 0 <= y + dy < side:
+                graph.add_edge(ids[cell], ids[cell + dx + dy * side], 1 + generator.random())
+    return graph
+
+
+if __name__ == '__main__':
+    from src.GraphAlgo import GraphAlgo
+    from src.ReachabilityIndex import ReachabilityIndex
+    parser = argparse.ArgumentParser(description="Traversal time of a shuffled grid before and after reordering")
+    parser.add_argument("--side", type=int, default=400)
+    parser.add_argument("--sources", type=int, default=5)
+    arguments = parser.parse_args()
+    original = shuffled_grid(arguments.side)
+    sources = rand.Random(1).sample(list(original.get_all_v()), arguments.sources)
+    graphs = [("original", original, sources)]
+    for name in ORDERS:
+        begin = time.perf_counter()
+        graph = reorder(original, name)
+        elapsed = time.perf_counter() - begin
+        new_ids = {key: i for i, key in enumerate(graph.original_ids)}
+        print(f"{name} reorder {elapsed:.2f}s")
+        graphs.append((name, graph, [new_ids[src] for src in sources]))
+    for name, graph, starts in graphs:
+        graph_algo = GraphAlgo(graph)
+        begin = time.perf_counter()
+        for src in starts:
+            graph_algo.dijkstra(src, tags=False)
+        dijkstra = (time.perf_counter() - begin) / len(starts)
+        begin = time.perf_counter()
+        for src in starts:
+            for _ in graph_algo.bfs(src):
+                pass
+        bfs = (time.perf_counter() - begin) / len(starts)
+        begin = time.perf_counter()
+        ReachabilityIndex(graph, traversals=1)
+        scc = time.perf_counter() - begin
+        print(f"{name:<9} dijkstra {dijkstra * 1000:8.1f} ms  bfs {bfs * 1000:8.1f} ms  scc index {scc * 1000:8.1f} ms")
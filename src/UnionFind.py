@@ -0,0 +1,111 @@
+class UnionFind:
+    """This class represents disjoint sets of node ids, the weakly connected components of a graph.
+
+    Every node id gets a dense index when it is added, the sets are kept in two lists indexed by it: the parent of
+    every index (a root is its own parent) and the rank of every root. union links the root of lower rank under the
+    other one and find compresses the path it walked, so both take amortized O(α(n)).
+    Sets can only be merged, removing an edge may split a component so the graph rebuilds it instead.
+    """
+
+    def __init__(self):
+        """
+        Constructor, no sets.
+        """
+        self.index = {}
+        self.keys = []
+        self.parent = []
+        self.rank = []
+        self.count = 0
+
+    def add(self, key) -> bool:
+        """
+        Adds key in a set of its own.
+        @param key: The node id
+        @return: True if the key was added, False if it was already there
+        """
+        if key in self.index:
+            return False
+        i = len(self.keys)
+        self.index[key] = i
+        self.keys.append(key)
+        self.parent.append(i)
+        self.rank.append(0)
+        self.count += 1
+        return True
+
+    def find(self, key) -> int:
+        """
+        Returns the index of the root of the set of key, every index on the way is linked straight to the root.
+        @param key: The node id, must have been added
+        @return: The root index
+        """
+        parent = self.parent
+        root = self.index[key]
+        while parent[root] != root:
+            root = parent[root]
+        i = self.index[key]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def union(self, key1, key2) -> bool:
+        """
+        Merges the sets of key1 and key2.
+        @return: True if they were in different sets, False o.w.
+        """
+        root1 = self.find(key1)
+        root2 = self.find(key2)
+        if root1 == root2:
+            return False
+        rank = self.rank
+        if rank[root1] < rank[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        if rank[root1] == rank[root2]:
+            rank[root1] += 1
+        self.count -= 1
+        return True
+
+    def connected(self, key1, key2) -> bool:
+        """
+        Returns True if key1 and key2 are in the same set, False o.w. or if one of them was not added.
+        """
+        if key1 not in self.index or key2 not in self.index:
+            return False
+        return self.find(key1) == self.find(key2)
+
+    def component_of(self, key) -> list:
+        """
+        Returns the keys in the set of key, O(n).
+        @param key: The node id
+        @return: list of node ids, empty if key was not added
+        """
+        if key not in self.index:
+            return []
+        root = self.find(key)
+        return [other for other in self.keys if self.find(other) == root]
+
+    def components(self) -> list:
+        """
+        Returns all the sets.
+        @return: list of lists of node ids
+        """
+        sets = {}
+        for key in self.keys:
+            sets.setdefault(self.find(key), []).append(key)
+        return list(sets.values())
+
+    def __eq__(self, other):
+        # Equal when they split the same keys into the same sets, whatever the order they were added and merged in
+        if isinstance(other, UnionFind):
+            if self.count != other.count or self.index.keys() != other.index.keys():
+                return False
+            return {frozenset(nodes) for nodes in self.components()} == \
+                   {frozenset(nodes) for nodes in other.components()}
+        return NotImplemented
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __repr__(self):
+        return f"|V|={len(self.keys)} |WCC|={self.count}"
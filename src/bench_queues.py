@@ -0,0 +1,58 @@
+from src.PriorityQueues import BinaryHeap, IndexedHeap, RadixHeap, DialBuckets
+from src.GraphAlgo import GraphAlgo
+from src.DiGraph import DiGraph
+from functools import partial
+import argparse
+import random as rand
+import time
+
+
+def random_graph(nodes: int, edges: int, quantum: float = None, seed: int = 0) -> DiGraph:
+    """
+    Creates a random graph, the weights are in [1, 2) or whole multiples of quantum in [quantum, 16 * quantum].
+    """
+    # A private generator, the random module of the caller is not reseeded
+    generator = rand.Random(seed)
+    graph = DiGraph()
+    for i in range(nodes):
+        graph.add_node(i)
+    while graph.e_size() < edges:
+        weight = generator.randint(1, 16) * quantum if quantum else 1 + generator.random()
+        graph.add_edge(generator.randrange(nodes), generator.randrange(nodes), weight)
+    return graph
+
+
+def bench(graph_algo: GraphAlgo, queue_types: dict, sources: int) -> None:
+    """
+    Prints the average time of a full dijkstra run with every queue type, from the same random sources.
+    """
+    keys = list(graph_algo.get_graph().get_all_v())
+    generator = rand.Random(1)
+    chosen = [generator.choice(keys) for _ in range(sources)]
+    for name, queue_type in queue_types.items():
+        graph_algo.queue_type = queue_type
+        start = time.perf_counter()
+        for src in chosen:
+            graph_algo.dijkstra(src)
+        print(f"  {name:<14}{(time.perf_counter() - start) / sources * 1000:10.2f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare the priority queues of dijkstra")
+    parser.add_argument("--sources", type=int, default=20)
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--edges", type=int, default=800000)
+    arguments = parser.parse_args()
+    queues = {"BinaryHeap": BinaryHeap, "IndexedHeap": IndexedHeap, "RadixHeap": RadixHeap,
+              "Dial(0.05)": partial(DialBuckets, 0.05)}
+    for file in ["../data/A5", "../data/G_1000_8000_1.json"]:
+        algo = GraphAlgo()
+        algo.load_from_json(file)
+        print(file, algo.get_graph())
+        bench(algo, queues, arguments.sources)
+    algo = GraphAlgo(random_graph(arguments.nodes, arguments.edges))
+    print("random", algo.get_graph())
+    bench(algo, queues, arguments.sources)
+    algo = GraphAlgo(random_graph(arguments.nodes, arguments.edges, quantum=1))
+    print("random, integer weights 1-16", algo.get_graph())
+    bench(algo, dict(queues, **{"Dial(1)": partial(DialBuckets, 1)}), arguments.sources)
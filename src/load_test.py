@@ -0,0 +1,95 @@
+import argparse
+import asyncio
+import json
+import random as rand
+import time
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, message: dict) -> dict:
+    """
+    Sends one request line and waits for its response line.
+    @return: the decoded response
+    """
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def client(host: str, port: int, path: str, queries: list, latencies: list) -> None:
+    """
+    Opens one connection and sends its queries one after the other, the latency of every query is added to
+    latencies.
+    @return: None
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    for message in queries:
+        start = time.perf_counter()
+        response = await request(reader, writer, message)
+        latencies.append(time.perf_counter() - start)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+    writer.close()
+    await writer.wait_closed()
+
+
+def percentile(values: list, percent: float) -> float:
+    """
+    Returns the percent percentile of values, nearest rank.
+    """
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def load_test(host: str = "127.0.0.1", port: int = 8765, path: str = None, connections: int = 16,
+                    queries: int = 1000, sources: int = 8, seed: int = 0) -> dict:
+    """
+    Sends shortest_path queries to a running GraphService from many connections at once and measures them.
+    The sources are drawn from a small pool so concurrent queries share a source and get coalesced.
+    @param connections: number of concurrent client connections
+    @param queries: total number of queries
+    @param sources: size of the pool of source nodes
+    @return: dictionary with the number of queries, seconds, throughput, p50 and p99 latency in seconds
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    # Bounded samples of the node ids, asking for all of them would not fit in one line on large graphs
+    pool = (await request(reader, writer, {"id": 0, "op": "sample_nodes", "args": [sources, seed]}))["result"]
+    nodes = (await request(reader, writer, {"id": 0, "op": "sample_nodes", "args": [queries, seed + 1]}))["result"]
+    writer.close()
+    await writer.wait_closed()
+
+    # A private generator, the random module of the caller is not reseeded
+    generator = rand.Random(seed)
+    # Deal the queries round robin over the connections
+    per_client = [[] for _ in range(connections)]
+    for i in range(queries):
+        message = {"id": i + 1, "op": "shortest_path", "args": [generator.choice(pool), generator.choice(nodes)]}
+        per_client[i % connections].append(message)
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, path, messages, latencies) for messages in per_client))
+    elapsed = time.perf_counter() - start
+    return {"queries": queries, "seconds": elapsed, "throughput": queries / elapsed,
+            "p50": percentile(latencies, 50), "p99": percentile(latencies, 99)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load test a running GraphService")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="unix socket path, used instead of host and port")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--sources", type=int, default=8)
+    arguments = parser.parse_args()
+    report = asyncio.run(load_test(arguments.host, arguments.port, arguments.unix, arguments.connections,
+                                   arguments.queries, arguments.sources))
+    print(f"{report['queries']} queries in {report['seconds']:.3f}s, {report['throughput']:.1f} q/s, "
+          f"p50 {report['p50'] * 1000:.2f}ms, p99 {report['p99'] * 1000:.2f}ms")
@@ -0,0 +1,104 @@
+from src.Centrality import betweenness_centrality, closeness_centrality, sampling_error, samples_for_error
+from src.GraphAlgo import GraphAlgo
+from src.DiGraph import DiGraph
+import math
+import random as rand
+import unittest
+
+
+class TestCentrality(unittest.TestCase):
+    def setUp(self):
+        rand.seed(2)
+        graph = DiGraph()
+        for i in range(30):
+            graph.add_node(i)
+        for _ in range(120):
+            graph.add_edge(rand.randrange(30), rand.randrange(30), rand.randint(1, 4))
+        self.graph = graph
+
+    def brute_force(self) -> (dict, dict):
+        """
+        Betweenness and closeness from all pairs distances and shortest path counts (Floyd-Warshall).
+        """
+        keys = list(self.graph.get_all_v())
+        dist = {(u, v): (0 if u == v else math.inf) for u in keys for v in keys}
+        for u in keys:
+            for v, weight in self.graph.all_out_edges_of_node(u).items():
+                dist[u, v] = weight
+        for w in keys:
+            for u in keys:
+                for v in keys:
+                    if dist[u, w] + dist[w, v] < dist[u, v]:
+                        dist[u, v] = dist[u, w] + dist[w, v]
+        sigma = {}
+        for u in keys:
+            sigma[u, u] = 1
+            for v in sorted((v for v in keys if v != u and dist[u, v] < math.inf), key=lambda v: dist[u, v]):
+                sigma[u, v] = sum(sigma[u, p] for p in self.graph.all_in_edges_of_node(v)
+                                  if (u, p) in sigma and dist[u, p] + self.graph.all_in_edges_of_node(v)[p] ==
+                                  dist[u, v])
+        betweenness = dict.fromkeys(keys, 0)
+        for s in keys:
+            for t in keys:
+                if s == t or dist[s, t] == math.inf:
+                    continue
+                for v in keys:
+                    if v not in (s, t) and dist[s, v] + dist[v, t] == dist[s, t]:
+                        betweenness[v] += sigma[s, v] * sigma[v, t] / sigma[s, t]
+        closeness = {}
+        for v in keys:
+            reach = [dist[u, v] for u in keys if u != v and dist[u, v] < math.inf]
+            closeness[v] = len(reach) / sum(reach) * len(reach) / (len(keys) - 1) if reach else 0.0
+        return betweenness, closeness
+
+    def test_exact(self):
+        betweenness, closeness = self.brute_force()
+        for key, value in betweenness_centrality(self.graph).items():
+            self.assertAlmostEqual(betweenness[key], value)
+        for key, value in closeness_centrality(self.graph).items():
+            self.assertAlmostEqual(closeness[key], value)
+        normalized = GraphAlgo(self.graph).betweenness_centrality(normalized=True)
+        self.assertAlmostEqual(betweenness[0] / (29 * 28), normalized[0])
+
+    def test_diamond(self):
+        graph = DiGraph()
+        for i in range(1, 6):
+            graph.add_node(i)
+        graph.add_edge(1, 2, 1)
+        graph.add_edge(1, 3, 1)
+        graph.add_edge(2, 4, 1)
+        graph.add_edge(3, 4, 1)
+        graph.add_edge(4, 5, 2)
+        self.assertEqual({1: 0, 2: 1, 3: 1, 4: 3, 5: 0}, GraphAlgo(graph).betweenness_centrality())
+
+    def test_workers(self):
+        # Chunks are summed in another order, so the last digits may differ
+        exact = betweenness_centrality(self.graph)
+        for key, value in betweenness_centrality(self.graph, workers=2).items():
+            self.assertAlmostEqual(exact[key], value)
+        exact = closeness_centrality(self.graph)
+        for key, value in closeness_centrality(self.graph, workers=2).items():
+            self.assertAlmostEqual(exact[key], value)
+
+    def test_sampled(self):
+        exact = betweenness_centrality(self.graph)
+        sampled = betweenness_centrality(self.graph, samples=15, seed=4)
+        bound = sampling_error(30, 15)
+        for key in exact:
+            self.assertLessEqual(abs(exact[key] - sampled[key]), bound)
+        self.assertEqual(exact, betweenness_centrality(self.graph, samples=30))
+        self.assertEqual(30, samples_for_error(30, 0.001))
+        n = 10 ** 6
+        samples = samples_for_error(n, 0.01)
+        self.assertLessEqual(sampling_error(n, samples) / ((n - 1) * (n - 2)), 0.01)
+        self.assertEqual(30, len(closeness_centrality(self.graph, samples=10)))
+        # Sampling leaves the global random state alone and repeats with the same seed
+        rand.seed(7)
+        expected = rand.random()
+        rand.seed(7)
+        self.assertEqual(sampled, betweenness_centrality(self.graph, samples=15, seed=4))
+        self.assertEqual(expected, rand.random())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+from src.DeltaStepping import DeltaStepping
+from src.GraphAlgo import GraphAlgo
+from src.DiGraph import DiGraph
+import math
+import os
+import unittest
+
+
+class TestDeltaStepping(unittest.TestCase):
+    def setUp(self):
+        self.graph_algo = GraphAlgo()
+        self.graph_algo.load_from_json("../data/G_1000_8000_1.json")
+
+    def dijkstra(self, src: int) -> dict:
+        self.graph_algo.dijkstra(src)
+        return {key: node.tag for key, node in self.graph_algo.get_graph().get_all_v().items() if node.tag != math.inf}
+
+    def test_same_as_dijkstra(self):
+        with DeltaStepping(self.graph_algo.get_graph()) as stepping:
+            self.assertLessEqual(1.0, stepping.delta)
+            for src in [0, 69, 420, 999]:
+                self.assertEqual(self.dijkstra(src), stepping.run(src)[0])
+            self.assertEqual(({}, {}), stepping.run(1000))
+        with DeltaStepping(self.graph_algo.get_graph(), delta=0.3) as stepping:
+            self.assertEqual(self.dijkstra(768), stepping.run(768)[0])
+
+    def test_no_edges(self):
+        with DeltaStepping(DiGraph()) as stepping:
+            self.assertEqual(1.0, stepping.delta)
+            self.assertEqual(({}, {}), stepping.run(0))
+        graph = DiGraph()
+        for i in range(3):
+            graph.add_node(i)
+        with DeltaStepping(graph) as stepping:
+            self.assertEqual(1.0, stepping.delta)
+            self.assertEqual(({1: 0}, {1: 1}), stepping.run(1))
+        GraphAlgo(DiGraph()).delta_stepping(0)
+
+    def test_failed_constructor(self):
+        graph = DiGraph()
+        graph.add_node(1)
+        # An edge to a node that is not in the graph fails while the arrays are filled
+        graph.edges_out_node[1] = {2: 1.0}
+        before = set(os.listdir("/dev/shm"))
+        with self.assertRaises(KeyError):
+            DeltaStepping(graph)
+        self.assertEqual(before, set(os.listdir("/dev/shm")))
+
+    def test_workers(self):
+        with DeltaStepping(self.graph_algo.get_graph(), workers=2, min_parallel=1) as stepping:
+            self.assertEqual(self.dijkstra(5), stepping.run(5)[0])
+
+    def test_graph_algo(self):
+        expected = [self.graph_algo.shortest_path(69, dest) for dest in range(0, 1000, 7)]
+        self.graph_algo.delta_stepping(69)
+        all_nodes = self.graph_algo.get_graph().get_all_v()
+        self.assertEqual([dist for dist, path in expected], [all_nodes[dest].tag for dest in range(0, 1000, 7)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,7 @@
 from src.DiGraph import DiGraph
+import os
+import subprocess
+import sys
 import unittest
 
 
@@ -99,6 +102,97 @@ class TestDiGraph(unittest.TestCase):
         graph = DiGraph(self.graph)
         self.assertEqual(graph, self.graph)
 
+    def test_node_slots(self):
+        node = self.graph.get_all_v()[1]
+        self.assertEqual(False, hasattr(node, "__dict__"))
+        graph = DiGraph(self.graph)
+        self.assertEqual(node, graph.get_all_v()[1])
+        self.assertEqual(node.tag, graph.get_all_v()[1].tag)
+
+    def test_fingerprint(self):
+        graph = DiGraph()
+        self.assertEqual(0, graph.get_fingerprint())
+        for i in range(14, 0, -1):
+            graph.add_node(i)
+        for src in range(14, 0, -1):
+            for dest, weight in self.graph.all_out_edges_of_node(src).items():
+                graph.add_edge(src, dest, weight)
+        self.assertEqual(self.graph.get_fingerprint(), graph.get_fingerprint())
+        self.assertEqual(self.graph.get_fingerprint(), DiGraph(self.graph).get_fingerprint())
+        fingerprint = graph.get_fingerprint()
+        graph.remove_edge(1, 2)
+        self.assertNotEqual(fingerprint, graph.get_fingerprint())
+        self.assertNotEqual(graph, self.graph)
+        graph.add_edge(1, 2, 5.0)
+        self.assertEqual(fingerprint, graph.get_fingerprint())
+        graph.remove_edge(1, 2)
+        graph.add_edge(1, 2, 6)
+        self.assertNotEqual(fingerprint, graph.get_fingerprint())
+        graph.remove_node(5)
+        graph.add_node(5, (1, 2, 0))
+        self.assertNotEqual(fingerprint, graph.get_fingerprint())
+        graph.remove_node(5)
+        graph.add_node(5)
+        self.assertEqual(graph.get_fingerprint(), DiGraph(graph).get_fingerprint())
+        # Ids outside 64 bits are hashed too, and the node is added whole
+        fingerprint = graph.get_fingerprint()
+        mc = graph.get_mc()
+        self.assertEqual(True, graph.add_node(2 ** 70))
+        self.assertEqual(True, graph.add_edge(2 ** 70, 1, 2))
+        self.assertEqual((mc + 2, True), (graph.get_mc(), graph.weakly_connected(1, 2 ** 70)))
+        self.assertNotEqual(fingerprint, graph.get_fingerprint())
+        graph.remove_node(2 ** 70)
+        self.assertEqual(fingerprint, graph.get_fingerprint())
+
+    def test_fingerprint_process(self):
+        # The fingerprint is a cache key across processes, nodes with and without pos and ids of any type included
+        code = ("from src.DiGraph import DiGraph\n"
+                "graph = DiGraph()\n"
+                "graph.add_node(1)\n"
+                "graph.add_node('a', (1.5, 2.0, 0.0))\n"
+                "graph.add_node(None)\n"
+                "graph.add_edge(1, 'a', 2.5)\n"
+                "print(graph.get_fingerprint())\n")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        fingerprints = {int(subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True,
+                                           check=True).stdout) for _ in range(2)}
+        graph = DiGraph()
+        graph.add_node(1)
+        graph.add_node('a', (1.5, 2.0, 0.0))
+        graph.add_node(None)
+        graph.add_edge(1, 'a', 2.5)
+        self.assertEqual({graph.get_fingerprint()}, fingerprints)
+
+    def test_weak_components(self):
+        # Built by the first query, not by add_node and add_edge
+        self.assertEqual(None, self.graph.weak)
+        weak = self.graph.get_weak_components()
+        self.assertEqual(1, weak.count)
+        self.assertEqual(True, self.graph.weakly_connected(14, 1))
+        self.graph.add_node(15)
+        self.graph.add_node(16)
+        self.assertEqual(3, weak.count)
+        self.assertEqual(False, self.graph.weakly_connected(1, 15))
+        self.assertEqual(False, self.graph.weakly_connected(1, 17))
+        self.graph.add_edge(16, 15, 1)
+        self.assertEqual(True, self.graph.weakly_connected(15, 16))
+        self.graph.add_edge(15, 1, 1)
+        self.assertEqual(True, self.graph.weakly_connected(1, 16))
+        self.assertEqual(1, weak.count)
+        # A removal can split a component, they are rebuilt from the edges when exact components are asked for
+        self.graph.remove_edge(15, 1)
+        self.assertEqual(True, self.graph.may_be_connected(1, 16))
+        self.assertIs(weak, self.graph.weak)
+        self.assertEqual(False, self.graph.may_be_connected(1, 17))
+        self.assertEqual(False, self.graph.weakly_connected(1, 16))
+        self.assertEqual(False, self.graph.may_be_connected(1, 16))
+        self.assertEqual(True, self.graph.weakly_connected(15, 16))
+        self.graph.remove_node(15)
+        self.assertEqual([[16]], [nodes for nodes in self.graph.get_weak_components().components() if 1 not in nodes])
+        self.assertEqual(DiGraph(self.graph).get_weak_components().components(),
+                         self.graph.get_weak_components().components())
+        self.assertEqual(sorted(self.graph.get_weak_components().component_of(3)), list(range(1, 15)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,67 @@
+from src.DiskGraph import DiskGraph
+from src.GraphAlgo import GraphAlgo
+import os
+import unittest
+
+
+class TestDiskGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph_algo = GraphAlgo()
+        self.graph_algo.load_from_json("../data/A5")
+        self.file = "Testing_DiskGraph.db"
+        self.disk = DiskGraph.from_graph(self.graph_algo.get_graph(), self.file, cache_size=4)
+
+    def tearDown(self):
+        self.disk.close()
+        os.remove(self.file)
+
+    def test_same_graph(self):
+        graph = self.graph_algo.get_graph()
+        self.assertEqual(graph.v_size(), self.disk.v_size())
+        self.assertEqual(graph.e_size(), self.disk.e_size())
+        self.assertEqual(graph.get_mc(), self.disk.get_mc())
+        self.assertEqual(set(graph.get_all_v()), set(self.disk.get_all_v()))
+        self.assertEqual(graph.get_all_v()[3].pos, self.disk.get_all_v()[3].pos)
+        for key in graph.get_all_v():
+            self.assertEqual(graph.all_out_edges_of_node(key), self.disk.all_out_edges_of_node(key))
+            self.assertEqual(graph.all_in_edges_of_node(key), self.disk.all_in_edges_of_node(key))
+
+    def test_algorithms(self):
+        disk_algo = GraphAlgo(self.disk)
+        for id1 in [0, 5, 13]:
+            for id2 in [1, 9, 47]:
+                self.assertEqual(self.graph_algo.shortest_path(id1, id2), disk_algo.shortest_path(id1, id2))
+        self.assertEqual((float('inf'), []), disk_algo.shortest_path(0, 100))
+        self.assertEqual(sorted(map(sorted, self.graph_algo.connected_components())),
+                         sorted(map(sorted, disk_algo.connected_components())))
+        self.assertLessEqual(len(self.disk.out_cache), 4)
+        # A cache of every node only misses the first time
+        self.disk.cache_size = 100
+        disk_algo.shortest_path(0, 47)
+        hits, misses = self.disk.hits, self.disk.misses
+        disk_algo.shortest_path(0, 47)
+        self.assertEqual(misses, self.disk.misses)
+        self.assertGreater(self.disk.hits, hits)
+
+    def test_changes(self):
+        self.assertEqual(False, self.disk.add_node(0))
+        self.assertEqual(True, self.disk.add_node(100, (1.0, 2.0, 0.0)))
+        self.assertEqual(False, self.disk.add_edge(0, 1, 5))
+        self.assertEqual(False, self.disk.add_edge(0, 101, 5))
+        out_edges = self.disk.all_out_edges_of_node(0)
+        self.assertEqual(True, self.disk.add_edge(0, 100, 5))
+        self.assertEqual(5, out_edges[100])
+        self.assertEqual({0: 5}, self.disk.all_in_edges_of_node(100))
+        self.assertEqual(True, self.disk.remove_node(0))
+        self.assertEqual(False, self.disk.remove_edge(0, 100))
+        self.assertEqual({}, self.disk.all_in_edges_of_node(100))
+        self.assertNotIn(0, self.disk.all_in_edges_of_node(1))
+        v_size, e_size, mc = self.disk.v_size(), self.disk.e_size(), self.disk.get_mc()
+        self.disk.close()
+        self.disk = DiskGraph(self.file)
+        self.assertEqual((v_size, e_size, mc), (self.disk.v_size(), self.disk.e_size(), self.disk.get_mc()))
+        self.assertEqual((1.0, 2.0, 0.0), self.disk.get_all_v()[100].pos)
+
+
+if __name__ == '__main__':
+    unittest.main()
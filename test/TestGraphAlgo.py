@@ -1,5 +1,10 @@
 from src.GraphAlgo import GraphAlgo
 from src.DiGraph import DiGraph
+from src.QueryLimit import CancelToken, Timeout, deadline_after
+from src.bench_queues import random_graph
+from src.PriorityQueues import DialBuckets
+from functools import partial
+import os
 import unittest
 
 
@@ -81,9 +86,8 @@ class TestGraphAlgo(unittest.TestCase):
         self.assertEqual(self.graph_algo.get_graph().get_all_v().keys(), graph_algo2.get_graph().get_all_v().keys())
         self.assertEqual(self.graph_algo.get_graph().v_size(), graph_algo2.get_graph().v_size())
         self.assertEqual(self.graph_algo.get_graph().e_size(), graph_algo2.get_graph().e_size())
-        dict1 = self.graph_algo.get_graph().__dict__
-        dict2 = graph_algo2.get_graph().__dict__
-        self.assertEqual(dict1, dict2)
+        # The loaded graph computes its fingerprint and weak components lazily, so compare the content, not __dict__
+        self.assertEqual(self.graph_algo.get_graph(), graph_algo2.get_graph())
         self.assertEqual(self.graph_algo.get_graph().all_in_edges_of_node(4), graph_algo2.get_graph().all_in_edges_of_node(4))
         self.graph_algo2.save_to_json("Testing_Save_2")
         graph_algo2.load_from_json("Testing_Save_2")
@@ -93,6 +97,23 @@ class TestGraphAlgo(unittest.TestCase):
         graph_algo2.get_graph().add_edge(1, 2, 5)
         self.assertEqual(graph_algo2.get_graph(), self.graph_algo2.get_graph())
 
+    def test_fingerprint_file(self):
+        try:
+            self.assertEqual(True, self.graph_algo.save_to_json("Testing_Fingerprint.json"))
+            graph_algo2 = GraphAlgo()
+            self.assertEqual(True, graph_algo2.load_from_json("Testing_Fingerprint.json", verify=True))
+            self.assertEqual(self.graph_algo.get_graph().get_fingerprint(), graph_algo2.get_graph().get_fingerprint())
+            with open("Testing_Fingerprint.json") as file:
+                text = file.read()
+            with open("Testing_Fingerprint.json", 'w') as file:
+                file.write(text.replace('"w": 5', '"w": 4', 1))
+            self.assertEqual(False, graph_algo2.load_from_json("Testing_Fingerprint.json", verify=True))
+            # Edited files still load without verify
+            self.assertEqual(True, graph_algo2.load_from_json("Testing_Fingerprint.json"))
+            self.assertEqual(4, graph_algo2.get_graph().all_out_edges_of_node(1)[2])
+        finally:
+            os.remove("Testing_Fingerprint.json")
+
     def test_shortest_path(self):
         self.assertEqual((16, [1, 5, 6, 11, 10, 12, 13]), self.graph_algo.shortest_path(1, 13))
         self.assertEqual((16, [9, 14, 8, 3]), self.graph_algo.shortest_path(9, 3))
@@ -105,12 +126,142 @@ class TestGraphAlgo(unittest.TestCase):
         self.assertEqual((float('inf'), []), self.graph_algo.shortest_path(0, 7))
         self.assertEqual((6, [3, 2, 4]), self.graph_algo.shortest_path(3, 4))
 
+    def test_weak_components(self):
+        graph_algo = GraphAlgo()
+        graph_algo.load_from_json("../data/A5")
+        self.assertEqual(None, graph_algo.get_graph().weak)
+        self.assertEqual([list(range(48))], graph_algo.weakly_connected_components())
+        self.assertEqual([list(range(1, 15)), [15]], self.graph_algo.weakly_connected_components())
+        stats = self.graph_algo.enable_stats()
+        # Different weak components are answered without dijkstra
+        self.assertEqual((float('inf'), []), self.graph_algo.shortest_path(1, 15))
+        self.assertEqual({}, stats.get("dijkstra"))
+        self.assertEqual((float('inf'), []), self.graph_algo.shortest_path(2, 1))
+        self.assertEqual(1, stats.get("dijkstra")["calls"])
+
+    def test_multi_source(self):
+        nearest = self.graph_algo.multi_source_dijkstra([1, 7, 20])
+        self.assertEqual((1, 0, 1), nearest[1])
+        self.assertEqual((7, 2, 7), nearest[4])
+        self.assertEqual((1, 4, 5), nearest[6])
+        self.assertNotIn(15, nearest)
+        for key, (source, dist, parent) in nearest.items():
+            self.assertEqual(min(self.graph_algo.shortest_path(1, key)[0], self.graph_algo.shortest_path(7, key)[0]),
+                             dist)
+            self.assertEqual(self.graph_algo.shortest_path(source, key)[0], dist)
+        reverse = self.graph_algo.multi_source_dijkstra([4, 13], reverse=True)
+        self.assertEqual((4, 6, 2), reverse[3])
+        self.assertEqual((13, 2, 13), reverse[12])
+        self.assertEqual((4, 2, 4), reverse[7])
+        for key, (source, dist, parent) in reverse.items():
+            self.assertEqual(self.graph_algo.shortest_path(key, source)[0], dist)
+
+    def test_k_nearest(self):
+        found = self.graph_algo.k_nearest_facilities([1, 7, 9, 20], 2)
+        self.assertEqual([(1, 0)], found[1])
+        self.assertEqual([(9, 0), (7, 3.2)], found[9])
+        for key, nearest in found.items():
+            expected = sorted((self.graph_algo.shortest_path(src, key)[0], src) for src in [1, 7, 9])
+            expected = [(src, dist) for dist, src in expected if dist != float('inf')][:2]
+            self.assertEqual([dist for src, dist in expected], [dist for src, dist in nearest])
+        found = self.graph_algo.k_nearest_facilities([4, 13], 2, reverse=True)
+        self.assertEqual([(4, 2), (13, self.graph_algo.shortest_path(7, 13)[0])], found[7])
+        self.assertEqual({}, self.graph_algo.k_nearest_facilities([20], 3))
+        # The queue of the other searches does not change the answer, even one that does not pop in exact order
+        graph_algo = GraphAlgo(random_graph(300, 1500))
+        found = graph_algo.k_nearest_facilities([0, 1, 2], 2)
+        graph_algo.queue_type = partial(DialBuckets, 1.0)
+        self.assertEqual(found, graph_algo.k_nearest_facilities([0, 1, 2], 2))
+
+    def test_iterators(self):
+        settled = list(self.graph_algo.iter_dijkstra(1))
+        self.assertEqual([(1, 0, 1), (5, 3, 1), (6, 4, 5), (2, 5, 1)], settled[:4])
+        self.assertEqual(13, len(settled))
+        self.assertEqual(sorted(dist for key, dist, parent in settled), [dist for key, dist, parent in settled])
+        for key, dist, parent in settled:
+            self.assertEqual(self.graph_algo.shortest_path(1, key)[0], dist)
+        self.assertEqual([(13, 0, 13), (12, 2, 13), (10, 4, 12)], self.graph_algo.nearest_nodes(13, 3, reverse=True))
+        self.assertEqual([1, 5, 6, 2], [key for key, dist, parent in self.graph_algo.nodes_within(1, 5)])
+        self.assertEqual([], list(self.graph_algo.iter_dijkstra(20)))
+        self.assertEqual([(1, 0, 1), (2, 1, 1), (5, 1, 1), (3, 2, 2), (4, 2, 2)],
+                         list(self.graph_algo.bfs(1))[:5])
+        self.assertEqual(13, len(list(self.graph_algo.bfs(1))))
+        self.assertEqual(set(range(1, 15)), {key for key, depth, parent in self.graph_algo.bfs(9, reverse=True)})
+        self.assertEqual([(1, 0, 1), (2, 1, 1), (3, 2, 2), (4, 3, 3), (9, 4, 4)], list(self.graph_algo.dfs(1))[:5])
+        self.assertEqual(13, len(list(self.graph_algo.dfs(1))))
+        self.assertEqual([(15, 0, 15)], list(self.graph_algo.dfs(15)))
+
     def test_connected_components(self):
         self.assertEqual([[1, 2, 3], [4, 5, 6], [7], [8, 9], [10], [11], [12, 13, 14]], self.graph_algo2.connected_components())
         self.assertEqual([4, 5, 6], self.graph_algo2.connected_component(4))
         self.assertEqual([12, 13, 14], self.graph_algo2.connected_component(12))
         self.assertEqual([], self.graph_algo2.connected_component(15))
 
+    def test_query_limits(self):
+        graph_algo = GraphAlgo(random_graph(3000, 12000))
+        dist, parent = graph_algo.dijkstra(0, tags=False)
+        # Far deadlines and tokens that are not cancelled change nothing
+        cancel = CancelToken()
+        self.assertEqual((dist, parent), graph_algo.dijkstra(0, tags=False, deadline=deadline_after(60), cancel=cancel))
+        self.assertEqual(graph_algo.shortest_path(0, 7), graph_algo.shortest_path(0, 7, cancel=cancel))
+        result = graph_algo.dijkstra(0, deadline=deadline_after(-1))
+        self.assertIsInstance(result, Timeout)
+        self.assertEqual(False, bool(result))
+        self.assertEqual("deadline", result.reason)
+        partial, partial_parent, radius = result.partial
+        self.assertGreater(len(dist), len([key for key, path in partial.items() if path <= radius]))
+        for key, path in partial.items():
+            if path <= radius:
+                self.assertEqual(dist[key], path)
+            self.assertLessEqual(dist[key], path)
+        far = max(dist, key=dist.get)
+        result = graph_algo.shortest_path(0, far, deadline=deadline_after(-1))
+        self.assertIsInstance(result, Timeout)
+        best, path = result.partial
+        self.assertEqual(True, best == float('inf') or best >= dist[far])
+        if path:
+            graph = graph_algo.get_graph()
+            self.assertAlmostEqual(best, sum(graph.all_out_edges_of_node(src)[dest]
+                                             for src, dest in zip(path, path[1:])))
+        # A node settled before the stop gets its exact answer
+        near = max((key for key, path in partial.items() if path <= radius and key != 0), key=partial.get)
+        self.assertEqual(graph_algo.shortest_path(0, near),
+                         graph_algo.shortest_path(0, near, deadline=deadline_after(-1)))
+        cancel.cancel()
+        result = graph_algo.connected_components(cancel=cancel)
+        self.assertEqual(("cancelled", []), (result.reason, result.partial))
+        self.assertEqual("cancelled", graph_algo.connected_component(0, cancel=cancel).reason)
+        self.assertEqual("cancelled", graph_algo.dijkstra_for_connected(0, True, cancel=cancel).reason)
+        self.assertEqual([[1, 2, 3], [4, 5, 6], [7], [8, 9], [10], [11], [12, 13, 14]],
+                         self.graph_algo2.connected_components(deadline=deadline_after(60)))
+
+    def test_stats(self):
+        self.assertEqual(None, self.graph_algo.stats)
+        calls = []
+        stats = self.graph_algo.enable_stats(lambda op, elapsed, counters: calls.append(op))
+        self.assertEqual((16, [1, 5, 6, 11, 10, 12, 13]), self.graph_algo.shortest_path(1, 13))
+        dijkstra = stats.get("dijkstra")
+        self.assertEqual(1, dijkstra["calls"])
+        self.assertEqual(13, dijkstra["counters"]["nodes_settled"])
+        self.assertEqual(dijkstra["counters"]["heap_pushes"], dijkstra["counters"]["heap_pops"])
+        self.assertEqual(dijkstra["counters"]["heap_pops"] - 13, dijkstra["counters"]["stale_pops"])
+        self.graph_algo2.stats = stats
+        self.graph_algo2.connected_component(4)
+        self.assertEqual(2, stats.get("dijkstra_for_connected")["calls"])
+        try:
+            self.assertEqual(True, self.graph_algo.save_to_json("Testing_Stats.json"))
+            self.assertEqual(True, self.graph_algo.load_from_json("Testing_Stats.json"))
+        finally:
+            os.remove("Testing_Stats.json")
+        self.assertEqual(24, stats.get("load_from_json")["counters"]["edges"])
+        self.assertEqual(15, stats.get("save_to_json")["counters"]["nodes"])
+        self.assertEqual(["dijkstra", "dijkstra_for_connected", "dijkstra_for_connected", "save_to_json",
+                          "load_from_json"], calls)
+        self.assertEqual({}, stats.get("connected_components"))
+        self.graph_algo.disable_stats()
+        self.graph_algo.shortest_path(1, 13)
+        self.assertEqual(1, stats.summary()["dijkstra"]["calls"])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,126 @@
+from src.GraphJournal import GraphJournal
+from src.GraphAlgo import GraphAlgo
+from src.DiGraph import DiGraph
+import os
+import unittest
+
+
+class TestGraphJournal(unittest.TestCase):
+    def setUp(self):
+        self.file_name = "Testing_Journal.json"
+        graph_algo = GraphAlgo()
+        graph_algo.load_from_json("../data/A1")
+        self.graph = graph_algo.get_graph()
+
+    def tearDown(self):
+        for name in [self.file_name, self.file_name + ".journal", self.file_name + ".tmp"]:
+            if os.path.exists(name):
+                os.remove(name)
+
+    def change(self, journal: GraphJournal):
+        self.assertEqual(True, journal.add_node(100, (1.5, 2.5, 0.0)))
+        self.assertEqual(False, journal.add_node(100))
+        self.assertEqual(True, journal.add_edge(100, 0, 2))
+        self.assertEqual(True, journal.remove_edge(0, 1))
+        self.assertEqual(True, journal.remove_node(5))
+        self.assertEqual(True, journal.update_edge(100, 0, 3.5))
+        self.assertEqual(False, journal.update_edge(0, 1, 3.5))
+
+    def test_recover(self):
+        journal = GraphJournal(self.file_name, DiGraph(self.graph))
+        self.change(journal)
+        self.assertEqual(5, journal.seq)
+        size = os.path.getsize(self.file_name)
+        # No close, the process "crashes" here
+        graph, seq, replayed = GraphJournal.recover(self.file_name)
+        self.assertEqual(size, os.path.getsize(self.file_name))
+        self.assertEqual(journal.get_graph(), graph)
+        self.assertEqual((5, 5), (seq, replayed))
+        self.assertEqual({0: 3.5}, graph.all_out_edges_of_node(100))
+        self.assertEqual((1.5, 2.5, 0.0), graph.get_all_v()[100].pos)
+        journal.close()
+        reopened = GraphJournal(self.file_name)
+        self.assertEqual(journal.get_graph(), reopened.get_graph())
+        self.assertEqual(True, reopened.add_edge(0, 1, 1))
+        reopened.close()
+        self.assertEqual(6, GraphJournal.recover(self.file_name)[1])
+
+    def test_compact(self):
+        journal = GraphJournal(self.file_name, DiGraph(self.graph), snapshot_every=3)
+        self.change(journal)
+        # 5 changes, compacted after the third
+        self.assertEqual(2, journal.changes)
+        journal.close()
+        with open(self.file_name + ".journal") as file:
+            self.assertEqual(2, len(file.readlines()))
+        self.assertEqual(journal.get_graph(), GraphJournal.recover(self.file_name)[0])
+
+    def test_crash_after_snapshot(self):
+        journal = GraphJournal(self.file_name, DiGraph(self.graph), snapshot_every=0)
+        self.change(journal)
+        journal.save()
+        with open(self.file_name + ".journal") as file:
+            old_journal = file.read()
+        journal.compact()
+        journal.close()
+        # The snapshot was replaced but the crash came before the journal was emptied
+        with open(self.file_name + ".journal", 'w') as file:
+            file.write(old_journal)
+        self.assertEqual((journal.get_graph(), 5, 0), GraphJournal.recover(self.file_name))
+
+    def test_crash_overwriting(self):
+        journal = GraphJournal(self.file_name, DiGraph())
+        journal.add_node(1)
+        journal.add_node(2)
+        journal.close()
+        with open(self.file_name + ".journal") as file:
+            old_journal = file.read()
+        graph = DiGraph()
+        graph.add_node(7)
+        journal = GraphJournal(self.file_name, graph)
+        # The numbering goes on from the files it replaced
+        self.assertEqual(2, journal.seq)
+        journal.close()
+        # The new snapshot was written but the crash came before the old journal was emptied
+        with open(self.file_name + ".journal", 'w') as file:
+            file.write(old_journal)
+        self.assertEqual((graph, 2, 0), GraphJournal.recover(self.file_name))
+
+    def test_torn_write(self):
+        journal = GraphJournal(self.file_name, DiGraph(self.graph))
+        self.change(journal)
+        journal.close()
+        with open(self.file_name + ".journal", 'a') as file:
+            file.write('{"op": "remove_node", "id"')
+        graph, seq, replayed = GraphJournal.recover(self.file_name)
+        self.assertEqual(journal.get_graph(), graph)
+        self.assertEqual(5, seq)
+        with open(self.file_name + ".journal", 'rb') as file:
+            self.assertEqual(True, file.read().endswith(b"}\n"))
+
+    def test_corrupt_line(self):
+        journal = GraphJournal(self.file_name, DiGraph(self.graph))
+        self.assertEqual(True, journal.add_node(100))
+        journal.close()
+        with open(self.file_name + ".journal", 'rb') as file:
+            good = file.read()
+        with open(self.file_name + ".journal", 'ab') as file:
+            file.write(b'{"op": "remove_node", "id": 0, \n{"op": "remove_node", "id": 1, "seq": 3}\n')
+        graph, seq, replayed = GraphJournal.recover(self.file_name)
+        # Replay stops at the damaged line, the line after it is dropped too
+        self.assertEqual((journal.get_graph(), 1, 1), (graph, seq, replayed))
+        with open(self.file_name + ".journal", 'rb') as file:
+            self.assertEqual(good, file.read())
+
+    def test_string_pos(self):
+        with open(self.file_name, 'w') as file:
+            file.write('{"Seq": 1, "Nodes": [{"id": 0, "pos": "1.5,2,0"}], "Edges": []}')
+        with open(self.file_name + ".journal", 'w') as file:
+            file.write('{"op": "add_node", "id": 1, "pos": "3,4.5,0", "seq": 2}\n')
+        graph = GraphJournal.recover(self.file_name)[0]
+        self.assertEqual((1.5, 2.0, 0.0), graph.get_all_v()[0].pos)
+        self.assertEqual((3.0, 4.5, 0.0), graph.get_all_v()[1].pos)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+from src.GraphService import GraphService
+from src.GraphAlgo import GraphAlgo
+from src.load_test import load_test
+import asyncio
+import json
+import unittest
+
+
+class TestGraphService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.graph_algo = GraphAlgo()
+        self.graph_algo.load_from_json("../data/A5")
+        self.service = GraphService(self.graph_algo)
+
+    def tearDown(self):
+        self.service.close()
+
+    async def test_shortest_path_coalesced(self):
+        expected = [GraphAlgo(self.graph_algo.get_graph()).shortest_path(1, dest) for dest in range(48)]
+        results = await asyncio.gather(*(self.service.shortest_path(1, dest) for dest in range(48)))
+        self.assertEqual(expected, list(results))
+        self.assertEqual(1, self.service.computations)
+        self.assertEqual({}, self.service.single_source)
+        self.assertEqual((float('inf'), []), await self.service.shortest_path(1, 100))
+        self.assertEqual((0, [3]), await self.service.shortest_path(3, 3))
+
+    async def test_connected(self):
+        expected = self.graph_algo.connected_components()
+        results = await asyncio.gather(self.service.connected_components(), self.service.connected_components())
+        self.assertEqual([expected, expected], list(results))
+        self.assertEqual(1, self.service.computations)
+        self.assertEqual(self.graph_algo.connected_component(0), await self.service.connected_component(0))
+        self.assertEqual([], await self.service.connected_component(100))
+
+    async def test_socket(self):
+        server = await self.service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b'{"id": 1, "op": "shortest_path", "args": [47, 19]}\n{"id": 2, "op": "nope"}\nbad\n'
+                     b'{"id": 3, "op": "sample_nodes", "args": [5, 1]}\n{"id": 4, "op": "info"}\n'
+                     b'{"id": 5, "op": "sample_nodes", "args": ["x"]}\n[1, 2]\n')
+        await writer.drain()
+        responses = {}
+        for _ in range(7):
+            response = json.loads(await reader.readline())
+            responses.setdefault(response["id"], []).append(response)
+        errors = sorted(response["error"] for response in responses.pop(None))
+        responses = {key: response for key, [response] in responses.items()}
+        self.assertEqual(["invalid json", "request must be a json object"], errors)
+        self.assertEqual(5, len(set(responses[3]["result"])))
+        self.assertEqual(self.service.sample_nodes(5, 1), responses[3]["result"])
+        self.assertEqual({"v_size": 48, "e_size": 166, "mc": self.graph_algo.get_graph().get_mc()},
+                         responses[4]["result"])
+        self.assertIn("error", responses[5])
+        self.assertEqual(list(self.graph_algo.shortest_path(47, 19)), responses[1]["result"])
+        self.assertEqual("unknown op nope", responses[2]["error"])
+        writer.close()
+        report = await load_test("127.0.0.1", port, connections=4, queries=40, sources=2)
+        self.assertEqual(40, report["queries"])
+        self.assertLessEqual(report["p50"], report["p99"])
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+from src.GraphView import NodeFilterView, EdgeFilterView, ReversedView
+from src.GraphAlgo import GraphAlgo
+from src.DiGraph import DiGraph
+import unittest
+
+
+class TestGraphView(unittest.TestCase):
+    def setUp(self):
+        graph = DiGraph()
+        for i in range(1, 15):
+            graph.add_node(i)
+        graph.add_edge(1, 2, 5)
+        graph.add_edge(2, 3, 2)
+        graph.add_edge(2, 4, 1)
+        graph.add_edge(3, 2, 5)
+        graph.add_edge(3, 4, 10)
+        graph.add_edge(1, 5, 3)
+        graph.add_edge(7, 3, 2)
+        graph.add_edge(7, 4, 2)
+        graph.add_edge(7, 9, 5)
+        graph.add_edge(9, 5, 3)
+        graph.add_edge(5, 4, 12)
+        graph.add_edge(4, 9, 1.2)
+        graph.add_edge(9, 14, 7)
+        graph.add_edge(14, 8, 3)
+        graph.add_edge(8, 3, 6)
+        graph.add_edge(5, 12, 17)
+        graph.add_edge(12, 13, 2)
+        graph.add_edge(13, 5, 9.4)
+        graph.add_edge(5, 6, 1)
+        graph.add_edge(6, 11, 4)
+        graph.add_edge(11, 10, 4)
+        graph.add_edge(10, 11, 4)
+        graph.add_edge(10, 12, 2)
+        graph.add_edge(3, 9, 3.5)
+        self.graph = graph
+
+    def test_node_filter(self):
+        view = NodeFilterView(self.graph, {1, 2, 3, 4, 5, 9})
+        self.assertEqual(6, view.v_size())
+        self.assertEqual(10, view.e_size())
+        self.assertEqual({1, 2, 3, 4, 5, 9}, set(view.get_all_v()))
+        self.assertEqual({2: 5, 5: 3}, view.all_out_edges_of_node(1))
+        self.assertEqual({1: 3, 9: 3}, view.all_in_edges_of_node(5))
+        self.assertEqual({}, view.all_out_edges_of_node(6))
+        self.assertNotIn(6, view.get_all_v())
+        self.assertEqual(False, view.add_node(20))
+        self.assertEqual(False, view.remove_edge(1, 2))
+        self.assertEqual((6, [1, 2, 4]), GraphAlgo(view).shortest_path(1, 4))
+        self.assertEqual((float('inf'), []), GraphAlgo(view).shortest_path(1, 13))
+        self.assertEqual([[1], [2, 3], [4, 9, 5]], GraphAlgo(view).connected_components())
+        self.graph.remove_node(3)
+        self.assertEqual(5, view.v_size())
+        self.assertEqual(6, view.e_size())
+
+    def test_truth(self):
+        calls = []
+
+        def accept(key):
+            calls.append(key)
+            return key > 2
+
+        view = NodeFilterView(self.graph, accept)
+        self.assertEqual(True, bool(view.get_all_v()))
+        # Stops at the first node shown instead of counting them all
+        self.assertEqual(3, len(calls))
+        self.assertEqual(False, bool(NodeFilterView(self.graph, set()).get_all_v()))
+        self.assertEqual(False, bool(view.all_out_edges_of_node(1)))
+
+    def test_edge_filter(self):
+        view = EdgeFilterView(self.graph, lambda weight: weight < 10)
+        self.assertEqual(14, view.v_size())
+        self.assertEqual(21, view.e_size())
+        self.assertEqual({2: 5, 9: 3.5}, view.all_out_edges_of_node(3))
+        self.assertEqual({}, view.all_out_edges_of_node(20))
+        light = EdgeFilterView(self.graph, lambda weight: weight < 2)
+        self.assertEqual((float('inf'), []), GraphAlgo(light).shortest_path(1, 12))
+        self.assertEqual((1.2, [4, 9]), GraphAlgo(light).shortest_path(4, 9))
+        self.assertEqual((16, [1, 5, 6, 11, 10, 12, 13]), GraphAlgo(view).shortest_path(1, 13))
+
+    def test_reversed(self):
+        view = ReversedView(self.graph)
+        self.assertEqual(24, view.e_size())
+        self.assertEqual(self.graph.all_in_edges_of_node(9), view.all_out_edges_of_node(9))
+        self.assertEqual((16, [13, 12, 10, 11, 6, 5, 1]), GraphAlgo(view).shortest_path(13, 1))
+        self.assertEqual((float('inf'), []), GraphAlgo(view).shortest_path(1, 2))
+        stacked = NodeFilterView(view, lambda node_id: node_id != 6)
+        self.assertEqual((22, [13, 12, 5, 1]), GraphAlgo(stacked).shortest_path(13, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
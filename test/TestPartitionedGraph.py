@@ -0,0 +1,39 @@
+from src.PartitionedGraph import PartitionedGraph, partition_by_id, partition_by_pos
+from src.GraphAlgo import GraphAlgo
+import unittest
+
+
+class TestPartitionedGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph_algo = GraphAlgo()
+        self.graph_algo.load_from_json("../data/G_100_800_1.json")
+
+    def test_partition(self):
+        graph = self.graph_algo.get_graph()
+        by_id = partition_by_id(graph, 3)
+        self.assertEqual(set(graph.get_all_v()), set(by_id))
+        self.assertEqual({0, 1, 2}, set(by_id.values()))
+        self.assertEqual(0, by_id[0])
+        self.assertEqual(2, by_id[99])
+        by_pos = partition_by_pos(graph, 4)
+        self.assertEqual([25, 25, 25, 25], [list(by_pos.values()).count(shard) for shard in range(4)])
+
+    def test_shortest_path(self):
+        graph = self.graph_algo.get_graph()
+        pairs = [(0, 71), (69, 15), (5, 5), (3, 200), (42, 17), (99, 0)]
+        for k, method in [(1, "id"), (3, "id"), (4, "pos")]:
+            with PartitionedGraph(graph, k, method) as partitioned:
+                for id1, id2 in pairs:
+                    self.assertEqual(self.graph_algo.shortest_path(id1, id2), partitioned.shortest_path(id1, id2))
+
+    def test_unreachable(self):
+        self.graph_algo.load_from_json("../data/A5")
+        self.graph_algo.get_graph().remove_edge(13, 14)
+        with PartitionedGraph(self.graph_algo.get_graph(), 2) as partitioned:
+            for id1, id2 in [(2, 20), (20, 2), (47, 19), (1, 7)]:
+                self.assertEqual(self.graph_algo.shortest_path(id1, id2), partitioned.shortest_path(id1, id2))
+        self.assertRaises(ValueError, PartitionedGraph, self.graph_algo.get_graph(), 2, "hash")
+
+
+if __name__ == '__main__':
+    unittest.main()
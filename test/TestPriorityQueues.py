@@ -0,0 +1,83 @@
+from src.PriorityQueues import BinaryHeap, IndexedHeap, RadixHeap, DialBuckets
+from src.GraphAlgo import GraphAlgo
+from src.DiGraph import DiGraph
+from src.bench_queues import random_graph
+from functools import partial
+import random as rand
+import unittest
+
+
+class TestPriorityQueues(unittest.TestCase):
+    def test_order(self):
+        rand.seed(3)
+        priorities = [rand.randrange(1000) / 4 for _ in range(500)]
+        for queue_type in [BinaryHeap, IndexedHeap, RadixHeap, partial(DialBuckets, 0.25)]:
+            queue = queue_type()
+            for item, priority in enumerate(priorities):
+                queue.push((priority, item))
+            self.assertEqual(500, len(queue))
+            popped = [queue.pop()[0] for _ in range(500)]
+            self.assertEqual(sorted(priorities), popped)
+            self.assertEqual(0, len(queue))
+
+    def test_monotone(self):
+        # Pushes mixed with pops, never below the last popped priority, like in dijkstra
+        for queue_type in [BinaryHeap, IndexedHeap, RadixHeap, DialBuckets]:
+            queue = queue_type()
+            queue.push((0, 0))
+            popped = []
+            for item in range(1, 200):
+                last = queue.pop()[0]
+                popped.append(last)
+                queue.push((last + item % 7, item))
+                queue.push((last + item % 3 + 1, -item))
+            self.assertEqual(sorted(popped), popped)
+
+    def test_decrease_key(self):
+        queue = IndexedHeap()
+        queue.push((5, 1))
+        queue.push((3, 2))
+        queue.push((4, 1))
+        queue.push((9, 2))
+        self.assertEqual(2, len(queue))
+        self.assertEqual((3, 2), queue.pop())
+        self.assertEqual((4, 1), queue.pop())
+
+    def test_dijkstra(self):
+        graph_algo = GraphAlgo()
+        graph_algo.load_from_json("../data/G_100_800_1.json")
+        expected = [graph_algo.shortest_path(0, dest) for dest in range(100)]
+        for queue_type in [IndexedHeap, RadixHeap, partial(DialBuckets, 0.1)]:
+            graph_algo.queue_type = queue_type
+            self.assertEqual(expected, [graph_algo.shortest_path(0, dest) for dest in range(100)])
+
+    def test_dial_quantized(self):
+        rand.seed(5)
+        graph = DiGraph()
+        for i in range(200):
+            graph.add_node(i)
+        for _ in range(1500):
+            graph.add_edge(rand.randrange(200), rand.randrange(200), rand.randint(1, 8) * 0.5)
+        graph_algo = GraphAlgo(graph)
+        stats = graph_algo.enable_stats()
+        # Equal length paths are common with quantized weights, so only the distances are compared
+        expected = [graph_algo.shortest_path(7, dest)[0] for dest in range(200)]
+        graph_algo.queue_type = partial(DialBuckets, 0.5)
+        stats.reset()
+        self.assertEqual(expected, [graph_algo.shortest_path(7, dest)[0] for dest in range(200)])
+        counters = stats.get("dijkstra")["counters"]
+        # Exact buckets, every reachable node is relaxed once
+        self.assertEqual(counters["nodes_settled"], counters["heap_pops"] - counters["stale_pops"])
+
+    def test_random_graph(self):
+        state = rand.getstate()
+        graph = random_graph(50, 200, seed=1)
+        # The same seed gives the same graph, from a generator of its own: the random module is not reseeded
+        self.assertEqual(state, rand.getstate())
+        self.assertEqual(200, graph.e_size())
+        self.assertEqual(graph, random_graph(50, 200, seed=1))
+        self.assertNotEqual(graph, random_graph(50, 200, seed=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
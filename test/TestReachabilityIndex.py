@@ -0,0 +1,60 @@
+from src.ReachabilityIndex import ReachabilityIndex
+from src.GraphAlgo import GraphAlgo
+import random
+import unittest
+
+
+class TestReachabilityIndex(unittest.TestCase):
+    def setUp(self):
+        self.graph_algo = GraphAlgo()
+        self.graph_algo.load_from_json("../data/A5")
+        self.graph_algo.get_graph().remove_edge(13, 14)
+
+    def reachable(self, src: int) -> set:
+        return set(self.graph_algo.dijkstra_for_connected(src, True))
+
+    def check_all_pairs(self, index: ReachabilityIndex):
+        keys = list(self.graph_algo.get_graph().get_all_v())
+        for id1 in keys:
+            reachable = self.reachable(id1)
+            self.assertEqual(reachable, set(index.reachable_from(id1)))
+            for id2 in keys:
+                self.assertEqual(id2 in reachable, index.is_reachable(id1, id2))
+
+    def test_a5(self):
+        index = ReachabilityIndex(self.graph_algo.get_graph())
+        self.check_all_pairs(index)
+        self.assertEqual(False, index.is_reachable(2, 100))
+        self.assertEqual([], index.reachable_from(100))
+        self.assertEqual(sorted(self.graph_algo.connected_component(0)), sorted(index.component_of(0)))
+
+    def test_sparse(self):
+        self.graph_algo.load_from_json("../data/G_100_800_1.json")
+        graph = self.graph_algo.get_graph()
+        for src in range(0, 100, 3):
+            for dest in list(graph.all_out_edges_of_node(src)):
+                graph.remove_edge(src, dest)
+        index = ReachabilityIndex(graph, traversals=1)
+        self.check_all_pairs(index)
+
+    def test_rebuild(self):
+        self.assertEqual(False, self.graph_algo.is_reachable(2, 20))
+        index = self.graph_algo.get_reachability()
+        self.graph_algo.get_graph().add_edge(13, 14, 1)
+        self.assertEqual(True, self.graph_algo.is_reachable(2, 20))
+        self.assertIs(index, self.graph_algo.get_reachability())
+        self.check_all_pairs(index)
+        self.graph_algo.load_from_json("../data/T0.json")
+        self.assertEqual([3], self.graph_algo.reachable_from(3))
+        self.assertEqual(True, self.graph_algo.is_reachable(0, 3))
+
+    def test_global_random(self):
+        random.seed(7)
+        expected = random.random()
+        random.seed(7)
+        ReachabilityIndex(self.graph_algo.get_graph(), traversals=3, seed=1)
+        self.assertEqual(expected, random.random())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+from src.Reorder import reorder, rcm_order, hilbert_order, hilbert_index, shuffled_grid, ORDERS
+from src.GraphAlgo import GraphAlgo
+import os
+import unittest
+
+
+class TestReorder(unittest.TestCase):
+    def setUp(self):
+        self.graph_algo = GraphAlgo()
+        self.graph_algo.load_from_json("../data/A5")
+
+    def check_same_graph(self, graph, relabeled):
+        original = relabeled.original_ids
+        self.assertEqual(list(range(graph.v_size())), list(relabeled.get_all_v()))
+        self.assertEqual(sorted(graph.get_all_v()), sorted(original))
+        self.assertEqual(graph.e_size(), relabeled.e_size())
+        for key in relabeled.get_all_v():
+            self.assertEqual(graph.get_all_v()[original[key]].pos, relabeled.get_all_v()[key].pos)
+            self.assertEqual(graph.all_out_edges_of_node(original[key]),
+                             {original[dest]: weight for dest, weight in relabeled.all_out_edges_of_node(key).items()})
+
+    def test_orders(self):
+        graph = self.graph_algo.get_graph()
+        for method in ORDERS:
+            relabeled = reorder(graph, method)
+            self.check_same_graph(graph, relabeled)
+            new_ids = {key: i for i, key in enumerate(relabeled.original_ids)}
+            dist, path = self.graph_algo.shortest_path(0, 47)
+            new_dist, new_path = GraphAlgo(relabeled).shortest_path(new_ids[0], new_ids[47])
+            self.assertAlmostEqual(dist, new_dist)
+            # Relabeling again maps back to the first ids
+            self.check_same_graph(graph, relabeled.relabeled(list(range(relabeled.v_size() - 1, -1, -1))))
+
+    def test_locality(self):
+        # A shuffled path 0 - 1 - ... - 9 gets consecutive ids from rcm and from hilbert
+        grid = shuffled_grid(1)
+        for i in range(10):
+            grid.add_node(100 + (i * 7) % 10, (float(i), 0.0, 0.0))
+        for i in range(9):
+            grid.add_edge(100 + (i * 7) % 10, 100 + ((i + 1) * 7) % 10, 1)
+        for order in [rcm_order(grid), hilbert_order(grid)]:
+            path = [key for key in order if key >= 100]
+            positions = [grid.get_all_v()[key].pos[0] for key in path]
+            self.assertIn(positions, [list(map(float, range(10))), list(map(float, range(9, -1, -1)))])
+        # The first 16 cells of the curve fill the 4 x 4 corner, every one next to the one before it
+        cells = sorted((hilbert_index(x, y), x, y) for x in range(4) for y in range(4))
+        self.assertEqual(list(range(16)), [index for index, x, y in cells])
+        for (_, x1, y1), (_, x2, y2) in zip(cells, cells[1:]):
+            self.assertEqual(1, abs(x1 - x2) + abs(y1 - y2))
+
+    def test_save_and_load(self):
+        relabeled = reorder(self.graph_algo.get_graph(), "hilbert")
+        file = "Testing_Reorder.json"
+        try:
+            self.assertEqual(True, GraphAlgo(relabeled).save_to_json(file))
+            graph_algo = GraphAlgo()
+            self.assertEqual(True, graph_algo.load_from_json(file))
+            self.assertEqual(relabeled, graph_algo.get_graph())
+            self.assertEqual(relabeled.original_ids, graph_algo.get_graph().original_ids)
+        finally:
+            os.remove(file)
+
+
+if __name__ == '__main__':
+    unittest.main()